@@ -1,42 +1,75 @@
 """Parse Contents.txt to create a mapping from abbreviations to full book names."""
 
 import re
+from functools import lru_cache
 from pathlib import Path
 
+# Match lines like: "Genesis   . . . . . . . . . . . . . . . . .   GEN "
+# or: "Doctrine-and-Covenants  . . . . . . . . . .   D&C"
+# or: "1-Nephi   . . . . . . . . . . . . . . . . .   NE1"
+# Pattern accounts for spaces between dots and numbers in abbreviations
+_CONTENTS_LINE_RE = re.compile(r"^([A-Za-z0-9\-&]+)\s+\.\s+\.\s+.*\s+([A-Z0-9&]+)\s*$")
+
+
+def parse_book_mapping(text: str) -> dict[str, str]:
+    """
+    Parse Contents.txt text into an abbreviation to book name mapping.
+
+    Args:
+        text: Contents of a Contents.txt file
+
+    Returns:
+        Dictionary mapping abbreviations (e.g., "GEN") to full book names (e.g., "Genesis")
+    """
+    mapping = {}
+
+    for line in text.splitlines():
+        # Every book line has dot leaders, so blank and header lines are rejected
+        # with a substring check instead of a regex match
+        if "." not in line:
+            continue
+
+        match = _CONTENTS_LINE_RE.match(line.strip())
+        if match:
+            book_name = match.group(1)
+            abbreviation = match.group(2)
+            mapping[abbreviation] = book_name
+
+    return mapping
+
 
 def load_book_mapping(contents_path: str | Path) -> dict[str, str]:
     """
     Parse the Contents.txt file to extract abbreviation to book name mappings.
 
+    Results are cached per file and invalidated when the file's mtime or size changes,
+    so repeated calls don't re-read and re-parse the file.
+
     Args:
         contents_path: Path to the Contents.txt file
 
     Returns:
         Dictionary mapping abbreviations (e.g., "GEN") to full book names (e.g., "Genesis")
     """
-    mapping = {}
     contents_path = Path(contents_path)
 
     if not contents_path.exists():
         raise FileNotFoundError(f"Contents file not found: {contents_path}")
 
-    with open(contents_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Match lines like: "Genesis   . . . . . . . . . . . . . . . . .   GEN "
-            # or: "Doctrine-and-Covenants  . . . . . . . . . .   D&C"
-            # or: "1-Nephi   . . . . . . . . . . . . . . . . .   NE1"
-            # Pattern accounts for spaces between dots and numbers in abbreviations
-            match = re.search(r"^([A-Za-z0-9\-&]+)\s+\.\s+\.\s+.*\s+([A-Z0-9&]+)\s*$", line)
-            if match:
-                book_name = match.group(1)
-                abbreviation = match.group(2)
-                mapping[abbreviation] = book_name
+    stat = contents_path.stat()
+    mapping = _load_book_mapping_cached(
+        str(contents_path.resolve()), stat.st_mtime_ns, stat.st_size
+    )
 
-    return mapping
+    # Hand out a copy so callers can't mutate the cached mapping
+    return dict(mapping)
+
+
+@lru_cache(maxsize=8)
+def _load_book_mapping_cached(contents_path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """Parse Contents.txt; mtime_ns and size are only part of the cache key."""
+    with open(contents_path, "r", encoding="utf-8") as f:
+        return parse_book_mapping(f.read())
 
 
 def get_default_mapping() -> dict[str, str]:
@@ -0,0 +1,257 @@
+"""Caches for query embeddings, search results and reranker scores."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Caches values keyed by an embedding, optionally matching near-duplicate keys.
+
+    A lookup hits when a cached embedding in the same namespace has a cosine
+    similarity of at least `threshold` with the query embedding. The default of
+    1.0 only matches embeddings pointing in exactly the same direction, so distinct
+    queries never share an entry; lower thresholds opt in to near-duplicate
+    matching. When full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int = 512, threshold: float = 1.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached entries
+            threshold: Minimum cosine similarity for a lookup to count as a hit.
+                      1.0 (the default) requires an exact match
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self._embeddings: np.ndarray | None = None
+        self._namespaces: list[Hashable] = []
+        self._values: list[Any] = []
+        self._last_used = np.zeros(max_size, dtype=np.int64)
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, embedding: np.ndarray, namespace: Hashable = None) -> Any | None:
+        """
+        Look up the value cached for the most similar embedding.
+
+        Args:
+            embedding: Query embedding
+            namespace: Only entries stored under this namespace can match
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            if not self._values:
+                return None
+
+            query = _normalize(embedding)
+            keys = self._embeddings[: len(self._values)]
+            if self.threshold >= 1.0:
+                # Rounding can leave the dot product of identical unit vectors just
+                # under 1.0, so exact matching compares the stored keys directly
+                similarities = (keys == query).all(axis=1).astype(np.float32)
+            else:
+                similarities = keys @ query
+
+            best_idx = -1
+            best_similarity = self.threshold
+            for idx in np.flatnonzero(similarities >= self.threshold):
+                if self._namespaces[idx] == namespace and similarities[idx] >= best_similarity:
+                    best_idx = idx
+                    best_similarity = similarities[idx]
+
+            if best_idx < 0:
+                return None
+
+            self._touch(best_idx)
+            return self._values[best_idx]
+
+    def put(self, embedding: np.ndarray, value: Any, namespace: Hashable = None) -> None:
+        """
+        Cache a value under an embedding.
+
+        Args:
+            embedding: Query embedding to key the value by
+            value: Value to cache
+            namespace: Namespace the entry belongs to
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            key = _normalize(embedding)
+            if self._embeddings is None:
+                self._embeddings = np.empty((self.max_size, key.shape[0]), dtype=np.float32)
+
+            if len(self._values) < self.max_size:
+                idx = len(self._values)
+                self._namespaces.append(namespace)
+                self._values.append(value)
+            else:
+                # Evict the least recently used entry
+                idx = int(np.argmin(self._last_used))
+                self._namespaces[idx] = namespace
+                self._values[idx] = value
+
+            self._embeddings[idx] = key
+            self._touch(idx)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._embeddings = None
+            self._namespaces.clear()
+            self._values.clear()
+            self._last_used[:] = 0
+
+    def _touch(self, idx: int) -> None:
+        self._clock += 1
+        self._last_used[idx] = self._clock
+
+
+class TTLCache:
+    """A size-bounded LRU mapping whose entries expire after a fixed time."""
+
+    def __init__(self, max_size: int = 4096, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached entries
+            ttl: Seconds an entry stays valid after it is stored
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None if it's missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class EmbeddingDiskCache:
+    """
+    A size-bounded SQLite store of float32 embeddings that persists between processes.
+
+    Entries are keyed by bytes (typically a content hash). When the store grows past
+    max_size, the least recently stored entries are deleted. The cache is best effort:
+    a write that fails because another process holds the database lock is dropped.
+    """
+
+    def __init__(self, path: str | Path, max_size: int = 65536):
+        """
+        Open or create the cache.
+
+        Args:
+            path: SQLite database file
+            max_size: Maximum number of stored embeddings (0 disables caching)
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            ((count,),) = self._db.execute("SELECT COUNT(*) FROM embeddings")
+        return count
+
+    def get_many(self, keys: list[bytes]) -> list[np.ndarray | None]:
+        """
+        Look up several embeddings at once.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            The embedding stored under each key, or None for keys that aren't cached
+        """
+        if not keys:
+            return []
+
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            found = dict(
+                self._db.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})", keys
+                )
+            )
+        return [
+            None if (blob := found.get(key)) is None else np.frombuffer(blob, dtype=np.float32)
+            for key in keys
+        ]
+
+    def put_many(self, items: Iterable[tuple[bytes, np.ndarray]]) -> None:
+        """Store (key, embedding) pairs, evicting the oldest entries when full."""
+        if self.max_size <= 0:
+            return
+
+        rows = [
+            (key, np.asarray(embedding, dtype=np.float32).tobytes()) for key, embedding in items
+        ]
+        try:
+            with self._lock, self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)", rows
+                )
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE rowid <= (SELECT MAX(rowid) FROM embeddings) - ?",
+                    (self.max_size,),
+                )
+        except sqlite3.OperationalError:
+            pass  # Locked by another process; the embeddings are just recomputed next time
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    """Return the embedding as a unit-length float32 vector."""
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -5,13 +5,17 @@ import sys
 
 from .indexer import index_scriptures
 from .query import ScriptureQueryEngine
+from .reranker import configure_torch_threads
 
 
 def cmd_index(args):
     """Handle the index command."""
     try:
         file_count, chunk_count = index_scriptures(
-            assets_dir=args.assets_dir, clear_existing=not args.append
+            assets_dir=args.assets_dir,
+            clear_existing=not args.append,
+            vector_store_backend=args.vector_store,
+            embedding_precision=args.precision,
         )
         print(f"\n✓ Successfully indexed {chunk_count} verses from {file_count} files")
         return 0
@@ -23,7 +27,14 @@ def cmd_index(args):
 def cmd_query(args):
     """Handle the query command."""
     try:
-        engine = ScriptureQueryEngine()
+        if args.torch_threads is not None:
+            configure_torch_threads(args.torch_threads or None)
+
+        engine = ScriptureQueryEngine(
+            vector_store_backend=args.vector_store,
+            embedding_precision=args.precision,
+            static_reranker=args.static_reranker,
+        )
 
         # Check if database is empty
         count = engine.vector_store.count()
@@ -49,6 +60,7 @@ def cmd_query(args):
             books=books,
             use_reranker=args.reranker,
             retrieval_factor=args.retrieval_factor,
+            refine_top=args.refine_top,
         )
 
         # Display LLM answer if available
@@ -105,6 +117,18 @@ def main():
         action="store_true",
         help="Append to existing index instead of clearing it",
     )
+    index_parser.add_argument(
+        "--vector-store",
+        choices=["chroma", "faiss"],
+        default="chroma",
+        help="Vector index to build (default: chroma)",
+    )
+    index_parser.add_argument(
+        "--precision",
+        choices=["float32", "int8", "binary"],
+        default="float32",
+        help="How the faiss index stores embeddings (default: float32)",
+    )
 
     # Query command
     query_parser = subparsers.add_parser("query", help="Query the scripture database")
@@ -130,12 +154,40 @@ def main():
         action="store_false",
         help="Disable cross-encoder reranking (faster but less accurate)",
     )
+    query_parser.add_argument(
+        "--static-reranker",
+        action="store_true",
+        help="Rerank with a static embedding model instead of the cross-encoder (faster on CPU)",
+    )
     query_parser.add_argument(
         "--retrieval-factor",
         type=float,
         default=3.0,
         help="Multiplier for initial retrieval when reranking (default: 3.0)",
     )
+    query_parser.add_argument(
+        "--refine-top",
+        type=int,
+        help="Only rerank this many candidates, picked by embedding similarity (default: all)",
+    )
+    query_parser.add_argument(
+        "--vector-store",
+        choices=["chroma", "faiss"],
+        default="chroma",
+        help="Vector index to search (default: chroma)",
+    )
+    query_parser.add_argument(
+        "--precision",
+        choices=["float32", "int8", "binary"],
+        default="float32",
+        help="Precision of the faiss index to search (default: float32)",
+    )
+    query_parser.add_argument(
+        "--torch-threads",
+        type=int,
+        help="Size torch's CPU thread pools for single-query inference; 0 picks the CPU count "
+        "capped at 8 (default: leave torch's defaults)",
+    )
 
     args = parser.parse_args()
 
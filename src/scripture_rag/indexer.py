@@ -2,16 +2,21 @@
 
 from pathlib import Path
 
-from .book_mapping import get_default_mapping
+from .book_mapping import load_book_mapping
 from .downloader import ensure_assets_downloaded
-from .parser import parse_all_scripture_files
-from .vector_store import ScriptureVectorStore
+from .parser import find_scripture_files, parse_all_scripture_files_soa
+from .vector_store import EMBEDDINGS_CACHE_DIR, create_vector_store
+
+# Parsed verses are cached in this file inside the assets directory between runs
+PARSE_CACHE_FILENAME = ".parsed-columns.bin"
 
 
 def index_scriptures(
     assets_dir: str | Path | None = None,
     persist_directory: str | Path | None = None,
     clear_existing: bool = True,
+    vector_store_backend: str = "chroma",
+    embedding_precision: str = "float32",
 ) -> tuple[int, int]:
     """
     Index all scripture files into the vector database.
@@ -20,6 +25,9 @@ def index_scriptures(
         assets_dir: Path to the assets directory. Defaults to ../../../assets relative to this file
         persist_directory: Directory to persist ChromaDB data. Defaults to ~/.scripture-rag/chroma
         clear_existing: Whether to clear the existing collection before indexing
+        vector_store_backend: Vector index to build, "chroma" or "faiss"
+        embedding_precision: How the faiss index stores embeddings, "float32", "int8"
+                             or "binary"
 
     Returns:
         Tuple of (number of files processed, number of chunks indexed)
@@ -29,28 +37,32 @@ def index_scriptures(
     assets_dir = ensure_assets_downloaded(assets_dir)
     print()
 
-    print(f"Loading book mappings from {assets_dir / 'Contents.txt'}...")
-    book_mapping = get_default_mapping()
+    contents_path = assets_dir / "Contents.txt"
+    print(f"Loading book mappings from {contents_path}...")
+    book_mapping = load_book_mapping(contents_path)
     print(f"Loaded {len(book_mapping)} book mappings")
 
     print(f"\nParsing scripture files from {assets_dir}...")
-    all_chunks = parse_all_scripture_files(assets_dir, book_mapping)
-    print(f"Parsed {len(all_chunks)} scripture chunks")
+    columns = parse_all_scripture_files_soa(
+        assets_dir, book_mapping, cache_path=assets_dir / PARSE_CACHE_FILENAME
+    )
+    chunk_count = len(columns["ids"])
+    print(f"Parsed {chunk_count} scripture chunks")
 
     # Count files (subdirectories with .txt files)
-    file_count = sum(
-        1 for subdir in assets_dir.iterdir() if subdir.is_dir() for _ in subdir.glob("*.txt")
-    )
+    file_count = len(find_scripture_files(assets_dir))
 
     print("\nInitializing vector store...")
-    vector_store = ScriptureVectorStore(persist_directory=persist_directory)
+    vector_store = create_vector_store(
+        vector_store_backend, persist_directory=persist_directory, precision=embedding_precision
+    )
 
     if clear_existing:
         print("Clearing existing collection...")
         vector_store.clear_collection()
 
-    print(f"Adding {len(all_chunks)} chunks to vector store...")
-    vector_store.add_chunks(all_chunks)
+    print(f"Adding {chunk_count} chunks to vector store...")
+    vector_store.add_columns(**columns, embeddings_cache_dir=EMBEDDINGS_CACHE_DIR)
 
     final_count = vector_store.count()
     print("\nIndexing complete!")
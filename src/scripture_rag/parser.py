@@ -1,11 +1,34 @@
 """Parse scripture text files into structured chunks with metadata."""
 
+import marshal
+import mmap
+import os
 import re
+import sys
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
+# Pattern to match lines like: "JON 1:1 Now the word of the LORD..."
+# or: "NE1 1:1 I, Nephi, having been born of goodly parents..."
+# It runs over a whole file at once, so whitespace between fields must not cross a newline
+_VERSE_RE = re.compile(
+    r"^[^\S\n]*([A-Z0-9&]+)[^\S\n]+(\d+):(\d+)[^\S\n]+(\S.*?)[^\S\n]*$", re.MULTILINE
+)
 
-@dataclass
+# Environment variable overriding the default number of parse processes
+PARSE_WORKERS_ENV = "SCRIPTURE_RAG_WORKERS"
+
+# Book mapping shared with parse workers, set once per process by _init_worker
+_worker_book_mapping: dict[str, str] = {}
+
+
+@dataclass(slots=True)
 class ScriptureChunk:
     """Represents a single verse chunk with its metadata."""
 
@@ -19,6 +42,57 @@ class ScriptureChunk:
     source_file: str
 
 
+def _iter_verses(
+    file_path: Path, book_mapping: dict[str, str]
+) -> Iterator[tuple[str, str, str, int, int, str, str]]:
+    """
+    Yield the fields of each verse in a scripture file.
+
+    Args:
+        file_path: Path to the scripture text file
+        book_mapping: Dictionary mapping abbreviations to full book names
+
+    Yields:
+        Tuples of (text, book, prefix, chapter, verse, reference, section_heading),
+        in ScriptureChunk field order (excluding section headers with verse 0)
+    """
+    current_section_heading = ""
+    last_prefix = None
+    book = ""
+
+    # Decode the whole file up front so invalid UTF-8 anywhere fails the file, then let
+    # the regex engine find the verse lines instead of looping over every line in Python.
+    # Decoding the raw bytes skips text mode's newline translation; _VERSE_RE already
+    # drops the \r of CRLF endings, so only files using bare \r need translating
+    content = file_path.read_bytes().decode("utf-8")
+    if "\n" not in content and "\r" in content:
+        content = content.replace("\r", "\n")
+
+    for prefix, chapter, verse, text in _VERSE_RE.findall(content):
+        # If verse is 0, it's a section heading. Check the digits as a string so
+        # heading lines skip the int conversions and book lookup entirely
+        if not verse.lstrip("0"):
+            current_section_heading = text
+            continue
+
+        chapter = int(chapter)
+        verse = int(verse)
+
+        # Get the full book name from the mapping. A file almost always holds a
+        # single book, so only look it up again when the prefix changes. Every chunk
+        # shares one interned prefix string; book, heading and source file strings are
+        # already shared since they come from the mapping or are carried forward
+        if prefix != last_prefix:
+            book = book_mapping.get(prefix, prefix)
+            last_prefix = sys.intern(prefix)
+        prefix = last_prefix
+
+        # Create a formatted reference
+        reference = f"{book} {chapter}:{verse}"
+
+        yield text, book, prefix, chapter, verse, reference, current_section_heading
+
+
 def parse_scripture_file(
     file_path: str | Path, book_mapping: dict[str, str]
 ) -> list[ScriptureChunk]:
@@ -33,82 +107,377 @@ def parse_scripture_file(
         List of ScriptureChunk objects (excluding section headers with verse 0)
     """
     file_path = Path(file_path)
-    chunks = []
-    current_section_heading = ""
+    source_file = str(file_path)
 
-    # Pattern to match lines like: "JON 1:1 Now the word of the LORD..."
-    # or: "NE1 1:1 I, Nephi, having been born of goodly parents..."
-    pattern = re.compile(r"^([A-Z0-9&]+)\s+(\d+):(\d+)\s+(.+)$")
+    return [
+        ScriptureChunk(*fields, source_file=source_file)
+        for fields in _iter_verses(file_path, book_mapping)
+    ]
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
 
-            match = pattern.match(line)
-            if not match:
-                continue
+def parse_scripture_file_columns(
+    file_path: str | Path, book_mapping: dict[str, str]
+) -> dict[str, list]:
+    """
+    Parse a scripture text file straight into parallel columns for the vector store.
 
-            prefix = match.group(1)
-            chapter = int(match.group(2))
-            verse = int(match.group(3))
-            text = match.group(4)
+    This skips building ScriptureChunk objects only to transpose them again when
+    they're inserted into ChromaDB.
 
-            # Get the full book name from the mapping
-            book = book_mapping.get(prefix, prefix)
+    Args:
+        file_path: Path to the scripture text file
+        book_mapping: Dictionary mapping abbreviations to full book names
+
+    Returns:
+        Dictionary with parallel "ids", "documents" and "metadatas" lists, in the
+        shape expected by ChromaDB's collection.add
+    """
+    file_path = Path(file_path)
+    source_file = str(file_path)
+    ids = []
+    documents = []
+    metadatas = []
+
+    for text, book, prefix, chapter, verse, reference, section_heading in _iter_verses(
+        file_path, book_mapping
+    ):
+        ids.append(f"{prefix}_{chapter}:{verse}")
+        documents.append(text)
+        metadatas.append(
+            {
+                "book": book,
+                "prefix": prefix,
+                "chapter": chapter,
+                "verse": verse,
+                "reference": reference,
+                "section_heading": section_heading,
+                "source_file": source_file,
+            }
+        )
+
+    return {"ids": ids, "documents": documents, "metadatas": metadatas}
+
+
+def _init_worker(book_mapping: dict[str, str]) -> None:
+    """Store the book mapping in a worker process so it isn't pickled per task."""
+    global _worker_book_mapping
+    _worker_book_mapping = book_mapping
+
+
+def _parse_in_worker[T](parse_fn: Callable[[str, dict[str, str]], T], file_path: str) -> T:
+    """Parse a single file inside a worker process using the shared book mapping."""
+    return parse_fn(file_path, _worker_book_mapping)
+
+
+def _parse_worker_count(max_workers: int | None) -> int:
+    """
+    Resolve the number of parse processes from the argument, env var, or CPU count.
+
+    An unset, empty or zero $SCRIPTURE_RAG_WORKERS means the CPU count. Any other
+    value that isn't a positive integer is reported with a warning and ignored.
+    """
+    if max_workers is not None:
+        return max_workers
+
+    value = os.environ.get(PARSE_WORKERS_ENV, "").strip()
+    try:
+        env_workers = int(value or 0)
+    except ValueError:
+        env_workers = -1
+    if env_workers < 0:
+        print(f"Warning: Ignoring invalid {PARSE_WORKERS_ENV}={value!r}, using the CPU count")
+        env_workers = 0
+    return env_workers or os.cpu_count() or 1
+
+
+def _map_scripture_files[T](
+    parse_fn: Callable[[str, dict[str, str]], T],
+    txt_files: list[str],
+    book_mapping: dict[str, str],
+    max_workers: int | None,
+    failed_files: list[str] | None = None,
+) -> Iterator[T]:
+    """
+    Run a per-file parse function over a process pool.
+
+    Results are yielded in the order of txt_files. Files that fail to parse are
+    reported with a warning, appended to failed_files if given, and skipped. With a
+    single worker the files are parsed in this process, skipping the cost of
+    starting a pool. Otherwise at most two files per worker are in flight, so
+    results don't pile up ahead of a slow consumer, and files that haven't
+    started yet are cancelled if the consumer stops early.
+    """
+    max_workers = _parse_worker_count(max_workers)
+
+    def failed(txt_file: str, e: Exception):
+        print(f"Warning: Failed to parse {txt_file}: {e}")
+        if failed_files is not None:
+            failed_files.append(txt_file)
+
+    if max_workers == 1:
+        for txt_file in txt_files:
+            try:
+                yield parse_fn(txt_file, book_mapping)
+            except Exception as e:
+                failed(txt_file, e)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(book_mapping,)
+    ) as executor:
+        pending = deque()
+        remaining = iter(txt_files)
+        try:
+            for txt_file in islice(remaining, 2 * max_workers):
+                pending.append((txt_file, executor.submit(_parse_in_worker, parse_fn, txt_file)))
 
-            # If verse is 0, it's a section heading
-            if verse == 0:
-                current_section_heading = text
+            while pending:
+                txt_file, future = pending.popleft()
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    pending.append(
+                        (next_file, executor.submit(_parse_in_worker, parse_fn, next_file))
+                    )
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed(txt_file, e)
+                else:
+                    yield result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def find_scripture_files(assets_dir: str | Path) -> list[str]:
+    """
+    Find all scripture text files in the subdirectories of the assets directory.
+
+    Args:
+        assets_dir: Path to the assets directory
+
+    Returns:
+        List of paths to the .txt files, one level below assets_dir
+    """
+    txt_files = []
+    with os.scandir(assets_dir) as subdirs:
+        for subdir in subdirs:
+            if not subdir.is_dir():
                 continue
+            with os.scandir(subdir.path) as entries:
+                txt_files.extend(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(".txt") and entry.is_file()
+                )
+    return txt_files
+
+
+def _scripture_manifest(txt_files: list[str]) -> list[tuple[str, int, int]]:
+    """Describe the current state of the scripture files as (path, mtime_ns, size)."""
+    manifest = []
+    for txt_file in sorted(txt_files):
+        stat = os.stat(txt_file)
+        manifest.append((txt_file, stat.st_mtime_ns, stat.st_size))
+    return manifest
+
+
+def _load_parse_cache(
+    cache_path: Path,
+    layout: str,
+    manifest: list[tuple[str, int, int]],
+    book_mapping: dict[str, str],
+) -> Any | None:
+    """
+    Load parse results from the cache file if it matches the current files.
+
+    Args:
+        cache_path: Path of the parse cache file
+        layout: Layout the caller expects the data in ("chunks" or "columns")
+        manifest: Current state of the scripture files, from _scripture_manifest
+        book_mapping: Dictionary mapping abbreviations to full book names
+
+    Returns:
+        The cached data, or None if the cache is missing, stale, unreadable or
+        was written in a different layout
+    """
+    try:
+        with open(cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            cached = marshal.loads(mm)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+    if (
+        not isinstance(cached, dict)
+        or cached.get("layout") != layout
+        or cached.get("manifest") != tuple(manifest)
+        or cached.get("book_mapping") != book_mapping
+    ):
+        return None
+
+    return cached.get("data")
+
+
+def _save_parse_cache(
+    cache_path: Path,
+    layout: str,
+    manifest: list[tuple[str, int, int]],
+    book_mapping: dict[str, str],
+    data: Any,
+) -> None:
+    """Write marshal-able parse results to the cache file, replacing it atomically."""
+    payload = {
+        "layout": layout,
+        "manifest": tuple(manifest),
+        "book_mapping": book_mapping,
+        "data": data,
+    }
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            marshal.dump(payload, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Failed to write parse cache {cache_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def iter_all_scripture_files(
+    assets_dir: str | Path,
+    book_mapping: dict[str, str],
+    max_workers: int | None = None,
+    failed_files: list[str] | None = None,
+) -> Iterator[ScriptureChunk]:
+    """
+    Lazily yield the chunks of all scripture text files in the assets directory.
+
+    Nothing is parsed until the first chunk is requested, and chunks are yielded
+    file by file. Worker processes only parse a couple of files ahead of the
+    caller, so callers can start consuming chunks without holding the whole
+    corpus in memory.
 
-            # Create a formatted reference
-            reference = f"{book} {chapter}:{verse}"
+    Args:
+        assets_dir: Path to the assets directory
+        book_mapping: Dictionary mapping abbreviations to full book names
+        max_workers: Maximum number of worker processes, as in parse_all_scripture_files
+        failed_files: Optional list that paths of files failing to parse are appended to
 
-            # Create the chunk
-            chunk = ScriptureChunk(
-                text=text,
-                book=book,
-                prefix=prefix,
-                chapter=chapter,
-                verse=verse,
-                reference=reference,
-                section_heading=current_section_heading,
-                source_file=str(file_path),
-            )
-            chunks.append(chunk)
+    Yields:
+        ScriptureChunk objects, in the order of find_scripture_files
+    """
+    txt_files = find_scripture_files(assets_dir)
+    if not txt_files:
+        return
 
-    return chunks
+    for chunks in _map_scripture_files(
+        parse_scripture_file, txt_files, book_mapping, max_workers, failed_files
+    ):
+        yield from chunks
 
 
 def parse_all_scripture_files(
-    assets_dir: str | Path, book_mapping: dict[str, str]
+    assets_dir: str | Path,
+    book_mapping: dict[str, str],
+    max_workers: int | None = None,
+    cache_path: str | Path | None = None,
 ) -> list[ScriptureChunk]:
     """
     Parse all scripture text files in the assets directory.
 
+    Files are parsed in parallel across a process pool since each one is independent.
+
+    When cache_path is given, the chunks are cached there the same way as in
+    parse_all_scripture_files_soa. The two functions tag their cache with its
+    layout, so sharing a cache_path between them only causes a re-parse.
+
     Args:
         assets_dir: Path to the assets directory
         book_mapping: Dictionary mapping abbreviations to full book names
+        max_workers: Maximum number of worker processes. Defaults to $SCRIPTURE_RAG_WORKERS,
+                    or the CPU count if that isn't set. 1 parses in this process
+        cache_path: Optional path of the parse cache file
 
     Returns:
         List of all ScriptureChunk objects from all files
     """
-    assets_dir = Path(assets_dir)
-    all_chunks = []
+    if cache_path is None:
+        return list(iter_all_scripture_files(assets_dir, book_mapping, max_workers))
 
-    # Walk through all subdirectories
-    for subdir in assets_dir.iterdir():
-        if not subdir.is_dir():
-            continue
+    txt_files = find_scripture_files(assets_dir)
+    if not txt_files:
+        return []
 
-        # Process all .txt files in each subdirectory
-        for txt_file in subdir.glob("*.txt"):
-            try:
-                chunks = parse_scripture_file(txt_file, book_mapping)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                print(f"Warning: Failed to parse {txt_file}: {e}")
+    cache_path = Path(cache_path)
+    manifest = _scripture_manifest(txt_files)
+    cached = _load_parse_cache(cache_path, "chunks", manifest, book_mapping)
+    if cached is not None:
+        return [ScriptureChunk(*fields) for fields in cached]
+
+    failed_files = []
+    all_chunks = list(iter_all_scripture_files(assets_dir, book_mapping, max_workers, failed_files))
+
+    # Don't cache a partial result, so parse failures are reported again next time.
+    # marshal can't store dataclasses, so each chunk is stored as a tuple of its fields
+    if not failed_files:
+        chunk_fields = attrgetter(*ScriptureChunk.__slots__)
+        _save_parse_cache(
+            cache_path, "chunks", manifest, book_mapping, list(map(chunk_fields, all_chunks))
+        )
 
     return all_chunks
+
+
+def parse_all_scripture_files_soa(
+    assets_dir: str | Path,
+    book_mapping: dict[str, str],
+    max_workers: int | None = None,
+    cache_path: str | Path | None = None,
+) -> dict[str, list]:
+    """
+    Parse all scripture text files in the assets directory into parallel columns.
+
+    This is the struct-of-arrays counterpart of parse_all_scripture_files, used by
+    the indexer to feed ChromaDB without an intermediate list of ScriptureChunk.
+
+    When cache_path is given, the parsed columns are stored there in a single
+    marshal file. Later calls memory-map and load that file instead of re-parsing,
+    as long as no .txt file was added, removed or modified and the book mapping
+    is unchanged.
+
+    Args:
+        assets_dir: Path to the assets directory
+        book_mapping: Dictionary mapping abbreviations to full book names
+        max_workers: Maximum number of worker processes. Defaults to $SCRIPTURE_RAG_WORKERS,
+                    or the CPU count if that isn't set. 1 parses in this process
+        cache_path: Optional path of the parse cache file
+
+    Returns:
+        Dictionary with parallel "ids", "documents" and "metadatas" lists
+    """
+    columns = {"ids": [], "documents": [], "metadatas": []}
+
+    txt_files = find_scripture_files(assets_dir)
+    if not txt_files:
+        return columns
+
+    if cache_path is not None:
+        cache_path = Path(cache_path)
+        manifest = _scripture_manifest(txt_files)
+        cached = _load_parse_cache(cache_path, "columns", manifest, book_mapping)
+        if cached is not None:
+            return cached
+
+    parsed_files = 0
+    for file_columns in _map_scripture_files(
+        parse_scripture_file_columns, txt_files, book_mapping, max_workers
+    ):
+        parsed_files += 1
+        for name, values in file_columns.items():
+            columns[name].extend(values)
+
+    # Don't cache a partial result, so parse failures are reported again next time
+    if cache_path is not None and parsed_files == len(txt_files):
+        _save_parse_cache(cache_path, "columns", manifest, book_mapping, columns)
+
+    return columns
@@ -1,19 +1,65 @@
 """RAG query engine with Gemini LLM integration."""
 
+import functools
 import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 import google.generativeai as genai
 
+from .cache import TTLCache
 from .downloader import ensure_assets_downloaded
-from .reranker import ScriptureReranker
-from .vector_store import ScriptureVectorStore
+from .reranker import ScriptureReranker, StaticReranker
+from .vector_store import create_vector_store
 
 
-@dataclass
+@functools.lru_cache(maxsize=64)
+def _build_where(books_key: str | tuple[str, ...] | None) -> dict | None:
+    """
+    Build the where filter for a book or tuple of books, reusing the dict for repeat filters.
+
+    The returned dict is shared between calls, so callers must not mutate it.
+    """
+    if isinstance(books_key, str):
+        return {"book": books_key}
+    if books_key:
+        return {"book": {"$in": list(books_key)}}
+    return None
+
+
+@functools.cache
+def _llm_executor() -> ThreadPoolExecutor:
+    """
+    Threads for LLM calls, so generation can overlap with other work.
+
+    Created on the first LLM call and shared by every engine, so engines that are
+    dropped don't leave idle threads behind.
+    """
+    return ThreadPoolExecutor(thread_name_prefix="scripture-rag-llm")
+
+
+def _result_cache_key(
+    query: str,
+    top_k: int,
+    books: str | list[str] | None,
+    use_reranker: bool,
+    retrieval_factor: float,
+    refine_top: int | None,
+) -> tuple:
+    """Build the result cache key for a search's arguments."""
+    books_key = tuple(books) if isinstance(books, list) else books
+    return (query, top_k, books_key, use_reranker, retrieval_factor, refine_top)
+
+
+@dataclass(slots=True, frozen=True)
 class QueryResult:
-    """Result of a scripture query."""
+    """
+    Result of a scripture query.
+
+    Results are frozen because cached searches hand the same objects to every caller.
+    """
 
     reference: str
     text: str
@@ -25,9 +71,14 @@ class QueryResult:
     reranker_score: float | None = None
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class RAGResponse:
-    """Response from the RAG engine including LLM-generated answer."""
+    """
+    Response from the RAG engine including LLM-generated answer.
+
+    Responses compare and hash by identity, so they can be kept in sets and dict keys
+    without walking every result on each comparison.
+    """
 
     query: str
     results: list[QueryResult]
@@ -37,19 +88,41 @@ class RAGResponse:
 class ScriptureQueryEngine:
     """RAG query engine for scripture search with LLM integration."""
 
-    def __init__(self, persist_directory: str | Path | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        persist_directory: str | Path | None = None,
+        api_key: str | None = None,
+        vector_store_backend: str = "chroma",
+        embedding_precision: str = "float32",
+        static_reranker: bool = False,
+        result_cache_size: int = 256,
+        result_cache_ttl: float = 3600.0,
+    ):
         """
         Initialize the query engine.
 
         Args:
             persist_directory: Directory where ChromaDB data is persisted
             api_key: Gemini API key. If not provided, uses GEMINI_API_KEY env var
+            vector_store_backend: Vector index to search, "chroma" or "faiss"
+            embedding_precision: Precision of the faiss index to search, "float32",
+                                "int8" or "binary"
+            static_reranker: Rerank with a static embedding model instead of the
+                            cross-encoder (much faster on CPU, somewhat less accurate)
+            result_cache_size: Number of searches whose final results are cached
+                              (0 disables caching)
+            result_cache_ttl: Seconds cached search results stay valid
         """
         # Ensure scripture assets are available
         ensure_assets_downloaded()
 
-        self.vector_store = ScriptureVectorStore(persist_directory=persist_directory)
-        self.reranker = ScriptureReranker()
+        self.vector_store = create_vector_store(
+            vector_store_backend,
+            persist_directory=persist_directory,
+            precision=embedding_precision,
+        )
+        self.reranker = StaticReranker.get() if static_reranker else ScriptureReranker.get()
+        self.result_cache = TTLCache(max_size=result_cache_size, ttl=result_cache_ttl)
 
         # Configure Gemini
         if api_key is None:
@@ -68,10 +141,14 @@ class ScriptureQueryEngine:
         books: str | list[str] | None = None,
         use_reranker: bool = True,
         retrieval_factor: float = 3.0,
+        refine_top: int | None = None,
     ) -> list[QueryResult]:
         """
         Search for relevant scripture passages.
 
+        Repeating a search with the same arguments returns the cached results
+        without querying the vector store or reranker again.
+
         Args:
             query: Search query
             top_k: Number of results to return
@@ -80,56 +157,246 @@ class ScriptureQueryEngine:
             use_reranker: Whether to use the cross-encoder reranker (default: True)
             retrieval_factor: Multiplier for initial retrieval when reranking
                             (default: 3.0, retrieves top_k * 3.0 candidates)
+            refine_top: If set, rerank only this many candidates, chosen by the
+                       similarity of their stored embeddings to the query
 
         Returns:
             List of QueryResult objects
         """
-        # Build the where filter for book filtering
-        where = None
-        if books is not None:
-            if isinstance(books, str):
-                where = {"book": books}
-            elif isinstance(books, list) and books:
-                where = {"book": {"$in": books}}
-
-        # Determine how many results to retrieve
-        n_results = top_k
+        cache_key = _result_cache_key(
+            query, top_k, books, use_reranker, retrieval_factor, refine_top
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        results_dict = self._retrieve(
+            query, top_k, books, use_reranker, retrieval_factor, refine_top
+        )
+        results = self._rank_results(query, results_dict, top_k, use_reranker, refine_top)
+        self.result_cache.put(cache_key, results)
+        return list(results)
+
+    def search_iter(
+        self,
+        query: str,
+        top_k: int = 5,
+        books: str | list[str] | None = None,
+        use_reranker: bool = True,
+        retrieval_factor: float = 3.0,
+        refine_top: int | None = None,
+    ) -> Iterator[QueryResult]:
+        """
+        Search for relevant scripture passages, building results as they're consumed.
+
+        Retrieval and reranking happen before this returns, but each QueryResult is
+        only built when the caller asks for it, so a caller that stops early (e.g. once
+        its prompt is long enough) doesn't pay for the rest. Results from an earlier
+        search() with the same arguments are reused, but partially consumed results
+        aren't cached.
+
+        Args:
+            query: Search query
+            top_k: Maximum number of results to yield
+            books: Optional book name(s) to filter by
+            use_reranker: Whether to use the cross-encoder reranker (default: True)
+            retrieval_factor: Multiplier for initial retrieval when reranking
+            refine_top: If set, rerank only this many candidates, chosen by the
+                       similarity of their stored embeddings to the query
+
+        Returns:
+            Iterator of QueryResult objects, best first
+        """
+        cached = self.result_cache.get(
+            _result_cache_key(query, top_k, books, use_reranker, retrieval_factor, refine_top)
+        )
+        if cached is not None:
+            return iter(cached)
+
+        results_dict = self._retrieve(
+            query, top_k, books, use_reranker, retrieval_factor, refine_top
+        )
+        selected = self._select_results(query, results_dict, top_k, use_reranker, refine_top)
+        return self._iter_results(results_dict, selected)
+
+    def batch_search(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        books: str | list[str] | None = None,
+        use_reranker: bool = True,
+        retrieval_factor: float = 3.0,
+        refine_top: int | None = None,
+    ) -> list[list[QueryResult]]:
+        """
+        Search for several queries at once, such as sub-queries expanded from one question.
+
+        All queries are embedded in one batch and retrieved with a single vector
+        store query; each query's candidates are then reranked separately.
+
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+            books: Optional book name(s) to filter by, as in search()
+            use_reranker: Whether to use the cross-encoder reranker (default: True)
+            retrieval_factor: Multiplier for initial retrieval when reranking
+            refine_top: If set, rerank only this many candidates, chosen by the
+                       similarity of their stored embeddings to the query
+
+        Returns:
+            One list of QueryResult objects per query
+        """
+        where = self._book_filter(books)
+        n_results = self._retrieval_count(top_k, use_reranker, retrieval_factor)
+
+        two_stage = use_reranker and refine_top is not None
+
+        results_dicts = self.vector_store.batch_query(
+            queries, n_results=n_results, where=where, include_embeddings=two_stage
+        )
+        if use_reranker and refine_top is None:
+            # Rerank every query's candidates together so they're scored in one predict call
+            reranked = self.reranker.rerank_many(
+                [
+                    (query, results_dict["documents"])
+                    for query, results_dict in zip(queries, results_dicts)
+                ],
+                top_k=top_k,
+            )
+            return [
+                self._build_results(results_dict, result.as_tuples())
+                for results_dict, result in zip(results_dicts, reranked)
+            ]
+
+        return [
+            self._rank_results(query, results_dict, top_k, use_reranker, refine_top)
+            for query, results_dict in zip(queries, results_dicts)
+        ]
+
+    def _book_filter(self, books: str | list[str] | None) -> dict | None:
+        """Build the where filter for book filtering."""
+        return _build_where(tuple(books) if isinstance(books, list) else books)
+
+    def _retrieval_count(self, top_k: int, use_reranker: bool, retrieval_factor: float) -> int:
+        """Determine how many candidates to retrieve."""
         if use_reranker:
-            n_results = max(top_k, int(top_k * retrieval_factor))
-
-        results_dict = self.vector_store.query(query, n_results=n_results, where=where)
-
-        # Build initial query results
-        query_results = []
-        for i in range(len(results_dict["documents"])):
-            metadata = results_dict["metadatas"][i]
-            query_results.append(
-                QueryResult(
-                    reference=metadata["reference"],
-                    text=results_dict["documents"][i],
-                    section_heading=metadata["section_heading"],
-                    book=metadata["book"],
-                    chapter=metadata["chapter"],
-                    verse=metadata["verse"],
-                    distance=results_dict["distances"][i],
+            return max(top_k, int(top_k * retrieval_factor))
+        return top_k
+
+    def _retrieve(
+        self,
+        query: str,
+        top_k: int,
+        books: str | list[str] | None,
+        use_reranker: bool,
+        retrieval_factor: float,
+        refine_top: int | None,
+    ) -> dict:
+        """Fetch one query's candidates from the vector store."""
+        where = self._book_filter(books)
+        n_results = self._retrieval_count(top_k, use_reranker, retrieval_factor)
+
+        two_stage = use_reranker and refine_top is not None
+
+        return self.vector_store.query(
+            query, n_results=n_results, where=where, include_embeddings=two_stage
+        )
+
+    def _rank_results(
+        self,
+        query: str,
+        results_dict: dict,
+        top_k: int,
+        use_reranker: bool,
+        refine_top: int | None = None,
+    ) -> list[QueryResult]:
+        """Turn one query's vector store results into QueryResults, reranking if enabled."""
+        selected = self._select_results(query, results_dict, top_k, use_reranker, refine_top)
+        return self._build_results(results_dict, selected)
+
+    def _select_results(
+        self,
+        query: str,
+        results_dict: dict,
+        top_k: int,
+        use_reranker: bool,
+        refine_top: int | None = None,
+    ) -> list[tuple[int, float | None]]:
+        """Pick the (index, reranker score) of each result to return, reranking if enabled."""
+        documents = results_dict["documents"]
+
+        if use_reranker and documents:
+            if refine_top is not None:
+                # The query embedding is cached by the vector store, so this doesn't re-encode
+                reranked = self.reranker.rerank_two_stage(
+                    query,
+                    self.vector_store.embed_queries([query])[0],
+                    results_dict["embeddings"],
+                    documents,
+                    top_k=top_k,
+                    refine_top=refine_top,
                 )
+            else:
+                reranked = self.reranker.rerank(query, documents, top_k=top_k)
+            return reranked.as_tuples()
+        return [(i, None) for i in range(min(top_k, len(documents)))]
+
+    def _build_results(
+        self, results_dict: dict, selected: list[tuple[int, float | None]]
+    ) -> list[QueryResult]:
+        """Build QueryResults for the selected (index, reranker score) pairs of a result set."""
+        # Object construction dominates here; pre-sizing the list with [None] * n and
+        # assigning by index benchmarks no faster than letting list() grow it
+        return list(self._iter_results(results_dict, selected))
+
+    def _iter_results(
+        self, results_dict: dict, selected: list[tuple[int, float | None]]
+    ) -> Iterator[QueryResult]:
+        """Lazily build QueryResults for the selected (index, reranker score) pairs."""
+        documents = results_dict["documents"]
+        metadatas = results_dict["metadatas"]
+        distances = results_dict["distances"]
+
+        # Only build QueryResults for the results being returned, not every candidate
+        return (
+            QueryResult(
+                reference=metadatas[i]["reference"],
+                text=documents[i],
+                section_heading=metadatas[i]["section_heading"],
+                book=metadatas[i]["book"],
+                chapter=metadatas[i]["chapter"],
+                verse=metadatas[i]["verse"],
+                distance=distances[i],
+                reranker_score=score,
             )
+            for i, score in selected
+        )
+
+    def _build_prompt(self, query: str, context: str) -> str:
+        """Build the LLM prompt from the question and retrieved passages."""
+        return f"""You are a helpful assistant that answers questions about \
+scripture passages.
+
+Question: {query}
+
+Relevant scripture passages:
+{context}
 
-        # Apply reranking if enabled
-        if use_reranker and query_results:
-            documents = [result.text for result in query_results]
-            reranked = self.reranker.rerank(query, documents, top_k=top_k)
+Please provide a helpful answer based on the scripture passages above. Include \
+citations in the format [Book Chapter:Verse] when referencing specific passages. \
+Keep your answer concise and accurate."""
 
-            # Reorder results based on reranker scores and add scores
-            reranked_results = []
-            for original_idx, score in reranked:
-                result = query_results[original_idx]
-                result.reranker_score = score
-                reranked_results.append(result)
+    def _start_llm(self, prompt: str) -> Future:
+        """
+        Start generating an LLM response in a background thread.
 
-            return reranked_results
+        Args:
+            prompt: Prompt to send to the model
 
-        return query_results[:top_k]
+        Returns:
+            Future resolving to the Gemini response
+        """
+        return _llm_executor().submit(self.model.generate_content, prompt)
 
     def query_with_llm(
         self,
@@ -138,6 +405,8 @@ class ScriptureQueryEngine:
         books: str | list[str] | None = None,
         use_reranker: bool = True,
         retrieval_factor: float = 3.0,
+        refine_top: int | None = None,
+        on_results: Callable[[list[QueryResult]], None] | None = None,
     ) -> RAGResponse:
         """
         Query scriptures and generate an answer using the LLM.
@@ -148,6 +417,10 @@ class ScriptureQueryEngine:
             books: Optional book name(s) to filter by
             use_reranker: Whether to use the cross-encoder reranker (default: True)
             retrieval_factor: Multiplier for initial retrieval when reranking
+            refine_top: If set, rerank only this many candidates, chosen by the
+                       similarity of their stored embeddings to the query
+            on_results: Optional callback invoked with the search results while the
+                       LLM answer is still being generated
 
         Returns:
             RAGResponse with search results and LLM-generated answer
@@ -159,6 +432,7 @@ class ScriptureQueryEngine:
             books=books,
             use_reranker=use_reranker,
             retrieval_factor=retrieval_factor,
+            refine_top=refine_top,
         )
 
         # Build context from retrieved passages
@@ -168,24 +442,19 @@ class ScriptureQueryEngine:
 
         context = "\n\n".join(context_parts)
 
-        # Generate answer with LLM if available
-        answer = None
+        # Start generating the answer in the background so callers can handle the
+        # results while the LLM call is in flight
+        answer_future = None
         if self.llm_available and context:
-            prompt = f"""You are a helpful assistant that answers questions about \
-scripture passages.
-
-Question: {query}
-
-Relevant scripture passages:
-{context}
+            answer_future = self._start_llm(self._build_prompt(query, context))
 
-Please provide a helpful answer based on the scripture passages above. Include \
-citations in the format [Book Chapter:Verse] when referencing specific passages. \
-Keep your answer concise and accurate."""
+        if on_results is not None:
+            on_results(results)
 
+        answer = None
+        if answer_future is not None:
             try:
-                response = self.model.generate_content(prompt)
-                answer = response.text
+                answer = answer_future.result().text
             except Exception as e:
                 print(f"Warning: Failed to generate LLM response: {e}")
 
@@ -199,6 +468,7 @@ Keep your answer concise and accurate."""
         books: str | list[str] | None = None,
         use_reranker: bool = True,
         retrieval_factor: float = 3.0,
+        refine_top: int | None = None,
     ) -> RAGResponse:
         """
         Query the scripture database.
@@ -210,6 +480,8 @@ Keep your answer concise and accurate."""
             books: Optional book name(s) to filter by
             use_reranker: Whether to use the cross-encoder reranker (default: True)
             retrieval_factor: Multiplier for initial retrieval when reranking
+            refine_top: If set, rerank only this many candidates, chosen by the
+                       similarity of their stored embeddings to the query
 
         Returns:
             RAGResponse with results and optional LLM answer
@@ -221,6 +493,7 @@ Keep your answer concise and accurate."""
                 books=books,
                 use_reranker=use_reranker,
                 retrieval_factor=retrieval_factor,
+                refine_top=refine_top,
             )
         else:
             results = self.search(
@@ -229,5 +502,6 @@ Keep your answer concise and accurate."""
                 books=books,
                 use_reranker=use_reranker,
                 retrieval_factor=retrieval_factor,
+                refine_top=refine_top,
             )
             return RAGResponse(query=query, results=results, answer=None)
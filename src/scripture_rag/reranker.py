@@ -1,59 +1,477 @@
 """Cross-encoder reranker for improving scripture search relevance."""
 
-from sentence_transformers import CrossEncoder
+import abc
+import functools
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
 
+import numpy as np
+import torch
+from sentence_transformers import CrossEncoder, SentenceTransformer
 
-class ScriptureReranker:
+from .cache import TTLCache
+from .quantization import quantize_dynamic_int8
+
+# Where exported and quantized ONNX cross-encoders are cached
+ONNX_CACHE_DIR = Path.home() / ".scripture-rag" / "onnx"
+
+# Quantization config passed to sentence-transformers' ONNX exporter, and the file it writes
+ONNX_QUANTIZATION_CONFIG = "avx512_vnni"
+ONNX_QUANTIZED_FILE = f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+
+# Reduced-precision modes for running the cross-encoder on an accelerator
+PRECISIONS = ("auto", "fp32", "fp16", "bf16")
+
+# Upper bound on intra-op threads; beyond this the small cross-encoder stops scaling
+MAX_TORCH_THREADS = 8
+
+# Set to 1 to load reranker models when the reranker is created instead of on first use
+PRELOAD_RERANKER_ENV = "SCRIPTURE_RAG_PRELOAD_RERANKER"
+
+
+@dataclass(slots=True)
+class RerankResult:
+    """Reranked documents as parallel arrays, highest score first."""
+
+    indices: np.ndarray
+    scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def as_tuples(self) -> list[tuple[int, float]]:
+        """Return (index, score) pairs as Python ints and floats."""
+        return list(zip(self.indices.tolist(), self.scores.tolist()))
+
+
+class _Reranker(abc.ABC):
+    """Shared behavior for rerankers; subclasses implement rerank()."""
+
+    # Model loaded when no model_name is given; subclasses override this
+    DEFAULT_MODEL_NAME: str
+
+    @classmethod
+    def get(cls, model_name: str | None = None) -> "_Reranker":
+        """
+        Return a reranker shared by every caller asking for the same class and model.
+
+        Query engines in one process share the instance, so the model is only loaded
+        once and its caches are shared.
+
+        Args:
+            model_name: Model to rerank with, or None for the class's default
+
+        Returns:
+            The shared reranker
+        """
+        # Resolve the default first, so get() and get(DEFAULT_MODEL_NAME) share an instance
+        return _shared_reranker(cls, model_name or cls.DEFAULT_MODEL_NAME)
+
+    @abc.abstractmethod
+    def rerank(self, query: str, documents: list[str], top_k: int | None = None) -> RerankResult:
+        """
+        Rerank documents based on relevance to the query.
+
+        Args:
+            query: The search query
+            documents: List of document texts to rerank
+            top_k: Number of top results to return. If None, returns all documents.
+
+        Returns:
+            Indices into the input documents list and their relevance scores, sorted
+            by score (highest first)
+        """
+
+    def rerank_many(
+        self, requests: list[tuple[str, list[str]]], top_k: int | None = None
+    ) -> list[RerankResult]:
+        """
+        Rerank the documents for several queries.
+
+        Args:
+            requests: (query, documents) pairs to rerank
+            top_k: Number of top results to return per query. If None, returns all documents.
+
+        Returns:
+            One RerankResult per request, in request order
+        """
+        return [self.rerank(query, documents, top_k=top_k) for query, documents in requests]
+
+    def rerank_two_stage(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        document_embeddings: np.ndarray,
+        documents: list[str],
+        top_k: int | None = None,
+        refine_top: int = 20,
+    ) -> RerankResult:
+        """
+        Rerank after narrowing the candidates with precomputed bi-encoder embeddings.
+
+        Documents are first scored by the dot product of their stored embeddings with
+        the query embedding, and only the best refine_top are passed to rerank().
+
+        Args:
+            query: The search query
+            query_embedding: Normalized embedding of the query
+            document_embeddings: Normalized embeddings of the documents, one row each
+            documents: List of document texts
+            top_k: Number of top results to return. If None, returns all refined documents.
+            refine_top: Number of documents to rerank after the bi-encoder cut
+
+        Returns:
+            Indices into the input documents list and their relevance scores, sorted
+            by score (highest first). Documents cut by the bi-encoder are omitted
+        """
+        candidates = np.arange(len(documents))
+        if refine_top < len(documents):
+            similarities = np.asarray(document_embeddings, dtype=np.float32) @ np.asarray(
+                query_embedding, dtype=np.float32
+            )
+            candidates = np.sort(np.argpartition(-similarities, refine_top)[:refine_top])
+
+        reranked = self.rerank(query, [documents[i] for i in candidates.tolist()], top_k=top_k)
+        return RerankResult(indices=candidates[reranked.indices], scores=reranked.scores)
+
+
+class ScriptureReranker(_Reranker):
     """Reranks scripture search results using a cross-encoder model."""
 
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
+    DEFAULT_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        quantize: bool = True,
+        batch_size: int = 64,
+        backend: str = "torch",
+        cache_size: int = 4096,
+        cache_ttl: float = 3600.0,
+        precision: str = "auto",
+    ):
         """
         Initialize the reranker.
 
         Args:
             model_name: HuggingFace model name for the cross-encoder.
                        Default is ms-marco-MiniLM-L-6-v2 (~80MB, fast and accurate)
+            quantize: Whether to quantize the model's Linear layers to int8 when it
+                     runs on CPU (default: True)
+            batch_size: Number of query-document pairs scored per forward pass. The
+                       default fits a typical retrieval fan-out (top_k * retrieval_factor)
+                       in a single pass
+            backend: "torch" (default) or "onnx". The ONNX backend runs an int8
+                    quantized export of the model on ONNX Runtime and requires
+                    `optimum[onnxruntime]`; without it the torch backend is used
+            cache_size: Number of (query, document) scores to cache (0 disables caching)
+            cache_ttl: Seconds a cached score stays valid
+            precision: Weight precision when the model runs on a GPU or Apple MPS:
+                      "fp16", "bf16", "fp32", or "auto" to use bf16 on CUDA devices
+                      that support it and fp16 otherwise. CPU inference stays fp32
         """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown reranker precision: {precision}")
+
         self.model_name = model_name
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.backend = backend
+        self.precision = precision
         self._model: CrossEncoder | None = None
+        self.score_cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self._predict_lock = threading.Lock()
+
+        if _preload_requested():
+            _ = self.model
 
     @property
     def model(self) -> CrossEncoder:
         """Lazy load the cross-encoder model."""
         if self._model is None:
-            self._model = CrossEncoder(self.model_name)
+            if self.backend == "onnx":
+                self._model = self._load_onnx_model()
+            if self._model is None:
+                self._model = CrossEncoder(self.model_name)
+                module = self._model.model
+                if isinstance(module, torch.nn.Module):
+                    dtype = _reduced_precision_dtype(module, self.precision)
+                    if dtype is not None:
+                        module.to(dtype)
+                    elif self.quantize:
+                        quantize_dynamic_int8(module)
         return self._model
 
-    def rerank(
-        self, query: str, documents: list[str], top_k: int | None = None
-    ) -> list[tuple[int, float]]:
+    def _load_onnx_model(self) -> CrossEncoder | None:
+        """
+        Load an int8 quantized ONNX export of the cross-encoder.
+
+        The model is exported and quantized the first time, then reused from
+        ONNX_CACHE_DIR on later runs.
+
+        Returns:
+            The ONNX-backed cross-encoder, or None if ONNX support isn't installed
+        """
+        export_dir = ONNX_CACHE_DIR / self.model_name.replace("/", "__")
+
+        try:
+            if not (export_dir / ONNX_QUANTIZED_FILE).exists():
+                # Only in sentence-transformers >= 4, so import it where a missing name
+                # falls back to torch like a missing ONNX runtime does
+                from sentence_transformers import export_dynamic_quantized_onnx_model
+
+                model = CrossEncoder(self.model_name, backend="onnx")
+                model.save_pretrained(str(export_dir))
+                export_dynamic_quantized_onnx_model(
+                    model, ONNX_QUANTIZATION_CONFIG, str(export_dir)
+                )
+
+            return CrossEncoder(
+                str(export_dir),
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_QUANTIZED_FILE},
+            )
+        except ImportError as e:
+            # sentence-transformers imports optimum/onnxruntime lazily for this backend,
+            # and older versions don't have the exporter at all
+            print(f"Warning: ONNX backend unavailable ({e}), falling back to torch")
+            return None
+
+    def _predict(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """
+        Score (query, document) pairs with the cross-encoder.
+
+        Calls are serialized, since the model's fast tokenizer can't be used from
+        several threads at once and every engine in the process may share this reranker.
+
+        Args:
+            pairs: (query, document) pairs to score
+
+        Returns:
+            Array of scores, one per pair in input order
+        """
+        # Every batch is padded to its longest pair, so when the pairs span several
+        # batches, score them shortest-first to keep similarly sized pairs together
+        order = None
+        if len(pairs) > self.batch_size:
+            order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]) + len(pairs[i][1]))
+            pairs = [pairs[i] for i in order]
+
+        # Get relevance scores, scoring all pairs in as few batched forward passes as possible
+        with self._predict_lock, torch.inference_mode():
+            scores = np.asarray(
+                self.model.predict(
+                    pairs,
+                    batch_size=min(self.batch_size, len(pairs)),
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
+            )
+
+        # Map scores back to the positions of the original pairs
+        if order is not None:
+            unsorted_scores = np.empty_like(scores)
+            unsorted_scores[order] = scores
+            scores = unsorted_scores
+
+        return scores
+
+    def rerank(self, query: str, documents: list[str], top_k: int | None = None) -> RerankResult:
         """
         Rerank documents based on relevance to the query.
 
+        Pairs scored before are served from the score cache, so repeating a query
+        (e.g. when paging through results) only tokenizes and scores new documents.
+
+        Args:
+            query: The search query
+            documents: List of document texts to rerank
+            top_k: Number of top results to return. If None, returns all documents.
+
+        Returns:
+            Indices into the input documents list and their relevance scores, sorted
+            by score (highest first)
+        """
+        return self.rerank_many([(query, documents)], top_k=top_k)[0]
+
+    def rerank_many(
+        self, requests: list[tuple[str, list[str]]], top_k: int | None = None
+    ) -> list[RerankResult]:
+        """
+        Rerank the documents for several queries.
+
+        Pairs missing from the score cache are gathered from every request and scored
+        in one length-sorted predict call, so the batches stay full and similarly
+        sized across requests.
+
+        Args:
+            requests: (query, documents) pairs to rerank
+            top_k: Number of top results to return per query. If None, returns all documents.
+
+        Returns:
+            One RerankResult per request, in request order
+        """
+        # Reuse scores for (query, document) pairs we've already scored
+        keys = [[_score_key(query, doc) for doc in documents] for query, documents in requests]
+        scores = [np.empty(len(documents), dtype=np.float64) for _, documents in requests]
+        missing = []
+        for r, request_keys in enumerate(keys):
+            for i, key in enumerate(request_keys):
+                cached = self.score_cache.get(key)
+                if cached is None:
+                    missing.append((r, i))
+                else:
+                    scores[r][i] = cached
+
+        if missing:
+            pairs = [(requests[r][0], requests[r][1][i]) for r, i in missing]
+            for (r, i), score in zip(missing, self._predict(pairs).tolist()):
+                scores[r][i] = score
+                self.score_cache.put(keys[r][i], score)
+
+        return [_rank(request_scores, top_k) for request_scores in scores]
+
+
+class StaticReranker(_Reranker):
+    """
+    Reranks scripture search results with a static embedding model.
+
+    Static models (Model2Vec-style) embed text by averaging token embeddings with no
+    transformer layers, so scoring is an embedding lookup plus one matrix-vector
+    product instead of a cross-encoder forward pass per document. It is far faster
+    on CPU than ScriptureReranker, at some cost in accuracy.
+    """
+
+    DEFAULT_MODEL_NAME = "sentence-transformers/static-retrieval-mrl-en-v1"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        cache_size: int = 65536,
+    ):
+        """
+        Initialize the reranker.
+
+        Args:
+            model_name: HuggingFace name of a static sentence-transformers model
+            cache_size: Number of document embeddings to keep (0 disables caching)
+        """
+        self.model_name = model_name
+        self._model: SentenceTransformer | None = None
+        # Verses don't change, so their embeddings never need to expire
+        self.embedding_cache = TTLCache(max_size=cache_size, ttl=float("inf"))
+
+        if _preload_requested():
+            _ = self.model
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """Lazy load the static embedding model."""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model
+
+    def rerank(self, query: str, documents: list[str], top_k: int | None = None) -> RerankResult:
+        """
+        Rerank documents by cosine similarity to the query.
+
         Args:
             query: The search query
             documents: List of document texts to rerank
             top_k: Number of top results to return. If None, returns all documents.
 
         Returns:
-            List of (index, score) tuples sorted by relevance score (highest first).
-            The index refers to the position in the input documents list.
+            Indices into the input documents list and their relevance scores, sorted
+            by score (highest first)
         """
         if not documents:
-            return []
+            return _rank(np.empty(0), top_k)
+
+        query_embedding = self.model.encode(
+            [query], normalize_embeddings=True, convert_to_numpy=True
+        )[0]
+
+        # Embed only documents we haven't seen before
+        keys = [hashlib.sha256(doc.encode()).digest() for doc in documents]
+        embeddings = [self.embedding_cache.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            new_embeddings = self.model.encode(
+                [documents[i] for i in missing], normalize_embeddings=True, convert_to_numpy=True
+            )
+            for i, embedding in zip(missing, new_embeddings):
+                embeddings[i] = embedding
+                self.embedding_cache.put(keys[i], embedding)
+
+        scores = np.vstack(embeddings).astype(np.float64) @ query_embedding
+        return _rank(scores, top_k)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_reranker(cls: type[_Reranker], model_name: str) -> _Reranker:
+    """Create the reranker that _Reranker.get() hands out for a class and model."""
+    return cls(model_name=model_name)
+
+
+def _rank(scores: np.ndarray, top_k: int | None) -> RerankResult:
+    """Return the indices and values of the top_k scores, highest first."""
+    # Select the top_k scores without sorting the rest, then order just those.
+    # Candidates stay in document order so ties keep their original order
+    negated = -scores
+    if top_k is not None and top_k < len(scores):
+        top = np.sort(np.argpartition(negated, max(top_k, 0))[: max(top_k, 0)])
+        top = top[np.argsort(negated[top], kind="stable")]
+    else:
+        top = np.argsort(negated, kind="stable")
+
+    return RerankResult(indices=top, scores=scores[top])
+
+
+def _reduced_precision_dtype(module: torch.nn.Module, precision: str) -> torch.dtype | None:
+    """Pick the dtype to cast an accelerator-resident model to, or None to keep fp32."""
+    parameter = next(module.parameters(), None)
+    if parameter is None or parameter.device.type == "cpu" or precision == "fp32":
+        return None
+    if precision == "fp16":
+        return torch.float16
+    if precision == "bf16":
+        return torch.bfloat16
+
+    # auto: bf16 keeps fp32's range, so prefer it where the GPU has native support
+    if parameter.device.type == "cuda" and torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    return torch.float16
+
+
+def _preload_requested() -> bool:
+    """Whether PRELOAD_RERANKER_ENV asks for models to be loaded up front."""
+    return os.environ.get(PRELOAD_RERANKER_ENV, "") not in ("", "0")
+
 
-        # Create query-document pairs for the cross-encoder
-        pairs = [[query, doc] for doc in documents]
+def configure_torch_threads(num_threads: int | None = None) -> None:
+    """
+    Size torch's CPU thread pools for single-request inference.
 
-        # Get relevance scores
-        scores = self.model.predict(pairs)
+    These are process-wide settings shared by the reranker, the embedding model and
+    any other torch user, so call this once at startup rather than per reranker.
 
-        # Create (index, score) tuples and sort by score descending
-        ranked_results = [(i, float(score)) for i, score in enumerate(scores)]
-        ranked_results.sort(key=lambda x: x[1], reverse=True)
+    Args:
+        num_threads: Intra-op threads. Defaults to the CPU count, capped at
+                    MAX_TORCH_THREADS
+    """
+    if num_threads is None:
+        num_threads = min(os.cpu_count() or 1, MAX_TORCH_THREADS)
+    torch.set_num_threads(num_threads)
+    try:
+        # Only allowed before any inter-op parallel work has started in the process
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
 
-        # Return top_k if specified
-        if top_k is not None:
-            ranked_results = ranked_results[:top_k]
 
-        return ranked_results
+def _score_key(query: str, document: str) -> bytes:
+    """Build the score cache key for a (query, document) pair."""
+    return hashlib.sha256(f"{query}\0{document}".encode()).digest()
@@ -1,50 +1,163 @@
 """ChromaDB vector store for scripture embeddings."""
 
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 import chromadb
+import numpy as np
+import torch
+from chromadb import Documents, EmbeddingFunction, Embeddings
 from chromadb.utils import embedding_functions
+from sentence_transformers import SentenceTransformer
 
+from .cache import EmbeddingDiskCache, SemanticCache, TTLCache
 from .parser import ScriptureChunk
+from .quantization import quantize_dynamic_int8
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+
+# How the FAISS store keeps embeddings: full floats, 8-bit scalar quantized or sign bits
+EMBEDDING_PRECISIONS = ("float32", "int8", "binary")
+
+# Where document embeddings are saved between indexing runs
+EMBEDDINGS_CACHE_DIR = Path.home() / ".scripture-rag" / "embeddings"
+
+# On CPU, corpora larger than this are embedded across a pool of worker processes
+PARALLEL_EMBED_THRESHOLD = 5000
+
+# Torch threads per embedding worker; more per process stops scaling and oversubscribes
+EMBED_WORKER_THREADS = 2
+
+# Upper bound on embedding worker processes, since each one loads its own copy of the model
+MAX_EMBED_WORKERS = 4
+
+# Number of query texts whose embeddings are kept for reuse (about 3 KB each)
+QUERY_EMBEDDING_CACHE_SIZE = 512
+
+# Query embeddings saved in the store's directory, so they're reused across CLI runs
+QUERY_EMBEDDING_DB = "query_embeddings.sqlite3"
+QUERY_EMBEDDING_DB_SIZE = 65536
+
+# Filters matching at most this many verses are searched exactly in memory instead of
+# through the HNSW index, and up to FILTER_SUBSET_CACHE_SIZE such subsets are kept loaded
+BRUTE_FORCE_FILTER_LIMIT = 1000
+FILTER_SUBSET_CACHE_SIZE = 16
+
+# Seconds a loaded filter subset is trusted, since a re-index by another process that
+# leaves the collection's size unchanged would otherwise never be noticed
+FILTER_SUBSET_TTL = 300.0
+
+# Number of metadata filters whose verse counts are remembered
+FILTER_COUNT_CACHE_SIZE = 1024
+
+# Binary search over-fetches this many candidates per result and rescores them
+BINARY_RESCORE_MULTIPLIER = 4
+
+# (metadata key, add_chunks_soa column) for each ScriptureChunk field stored as metadata
+METADATA_COLUMNS = (
+    ("book", "books"),
+    ("prefix", "prefixes"),
+    ("chapter", "chapters"),
+    ("verse", "verses"),
+    ("reference", "references"),
+    ("section_heading", "section_headings"),
+    ("source_file", "source_files"),
+)
 
 
 class ScriptureVectorStore:
     """Manages the ChromaDB vector store for scripture embeddings."""
 
-    def __init__(self, persist_directory: str | Path | None = None):
+    # Directory under ~/.scripture-rag used when no persist_directory is given
+    DEFAULT_DIRECTORY = "chroma"
+
+    def __init__(
+        self,
+        persist_directory: str | Path | None = None,
+        quantize: bool = False,
+        cache_size: int = 512,
+        cache_threshold: float = 1.0,
+        brute_force_limit: int = BRUTE_FORCE_FILTER_LIMIT,
+    ):
         """
         Initialize the vector store.
 
         Args:
             persist_directory: Directory to persist the ChromaDB data.
                              Defaults to ~/.scripture-rag/chroma
+            quantize: Whether to quantize the embedding model to int8 for CPU inference.
+                     Indexing and querying should use the same setting, since the
+                     quantized model produces slightly different embeddings
+            cache_size: Number of query results kept in the semantic cache (0 disables it)
+            cache_threshold: Cosine similarity at which a new query reuses the results
+                            cached for an earlier one. The default of 1.0 only reuses
+                            results for the same query; lower values also match
+                            near-duplicates
+            brute_force_limit: Metadata filters matching at most this many verses are
+                              searched exactly in memory rather than through the HNSW
+                              index (0 disables this)
         """
         if persist_directory is None:
-            persist_directory = Path.home() / ".scripture-rag" / "chroma"
+            persist_directory = Path.home() / ".scripture-rag" / self.DEFAULT_DIRECTORY
         else:
             persist_directory = Path(persist_directory)
 
         persist_directory.mkdir(parents=True, exist_ok=True)
+        self.persist_directory = persist_directory
+        self._open_client()
 
-        # Initialize ChromaDB client with persistence
-        self.client = chromadb.PersistentClient(path=str(persist_directory))
-
-        # Configure the embedding function (sentence-transformers)
+        # Load the embedding model (sentence-transformers), shared by every store in
+        # the process that uses the same quantization setting
         # Using all-mpnet-base-v2 for superior semantic understanding (768 dimensions)
         # Ideal for cross-reference queries and theological concept matching
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="sentence-transformers/all-mpnet-base-v2"
-        )
+        self.encoder = _load_encoder(EMBEDDING_MODEL_NAME, quantize)
+        self.quantize = quantize
+
+        # Chroma embeds through the same model instance
+        self.embedding_function = _EncoderEmbeddingFunction(self.encoder, EMBEDDING_MODEL_NAME)
 
-        # Collection name
+        # Collection name, and the collection handle once it has been looked up
         self.collection_name = "scriptures"
+        self._collection = None
 
-    def get_or_create_collection(self):
-        """Get or create the scriptures collection."""
-        return self.client.get_or_create_collection(
-            name=self.collection_name, embedding_function=self.embedding_function
+        # Results of recent queries, keyed by query embedding
+        self.query_cache = SemanticCache(max_size=cache_size, threshold=cache_threshold)
+
+        # Embeddings of recently seen query texts
+        self.query_embedding_cache = TTLCache(max_size=QUERY_EMBEDDING_CACHE_SIZE, ttl=float("inf"))
+        self.query_embedding_disk_cache = EmbeddingDiskCache(
+            persist_directory / QUERY_EMBEDDING_DB, max_size=QUERY_EMBEDDING_DB_SIZE
         )
 
+        # Number of verses matching each metadata filter (as JSON), so searches over an
+        # empty index or filter can skip embedding the query, and the verses of small
+        # filters, loaded for exact search. Both are dropped when the collection's size
+        # changes, which also catches verses added by another process
+        self.brute_force_limit = brute_force_limit
+        self._collection_count: int | None = None
+        self._filter_counts = TTLCache(max_size=FILTER_COUNT_CACHE_SIZE, ttl=float("inf"))
+        self._filter_subsets = TTLCache(max_size=FILTER_SUBSET_CACHE_SIZE, ttl=FILTER_SUBSET_TTL)
+
+    def _open_client(self):
+        """Initialize the ChromaDB client with persistence."""
+        self.client = chromadb.PersistentClient(path=str(self.persist_directory))
+
+    def get_or_create_collection(self):
+        """Get or create the scriptures collection, reusing the handle after the first call."""
+        if self._collection is None:
+            self._collection = self.client.get_or_create_collection(
+                name=self.collection_name, embedding_function=self.embedding_function
+            )
+        return self._collection
+
     def clear_collection(self):
         """Delete and recreate the collection (useful for re-indexing)."""
         try:
@@ -52,43 +165,310 @@ class ScriptureVectorStore:
         except Exception:
             pass  # Collection doesn't exist, that's fine
 
+        self._collection = None
+        self._clear_query_caches()
         return self.get_or_create_collection()
 
-    def add_chunks(self, chunks: list[ScriptureChunk], batch_size: int = 100):
+    def embed(self, texts: list[str], batch_size: int = 256) -> np.ndarray:
+        """
+        Embed texts with the collection's sentence-transformers model.
+
+        Calls the model's native batched encode directly so the batch size is under our
+        control instead of Chroma's per-call embedding path.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Number of texts the model encodes per forward pass
+
+        Returns:
+            Array of shape (len(texts), embedding_dim)
+        """
+        return self.encoder.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def embed_documents(
+        self,
+        documents: list[str],
+        batch_size: int = 256,
+        cache_dir: str | Path | None = None,
+    ) -> np.ndarray:
+        """
+        Embed all documents up front, optionally reusing embeddings saved by an earlier run.
+
+        Args:
+            documents: Texts to embed
+            batch_size: Number of texts the model encodes per forward pass
+            cache_dir: Optional directory to load saved embeddings from and save them to.
+                      Files are named by model and corpus, so saved embeddings are only
+                      reused for identical documents and model settings
+
+        Returns:
+            Array of shape (len(documents), embedding_dim). Embeddings loaded from the
+            cache are float16
+        """
+        if not documents:
+            return self.embed(documents, batch_size=batch_size)
+
+        return np.concatenate(
+            list(self.iter_document_embeddings(documents, batch_size, cache_dir=cache_dir))
+        )
+
+    def iter_document_embeddings(
+        self,
+        documents: list[str],
+        batch_size: int = 256,
+        cache_dir: str | Path | None = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield document embeddings one batch at a time.
+
+        The next batch is embedded while the caller works on the current one, so
+        inserting batch i overlaps with encoding batch i + 1.
+
+        Args:
+            documents: Texts to embed
+            batch_size: Number of documents per yielded batch
+            cache_dir: Optional directory to load saved embeddings from and save them to,
+                      as in embed_documents. New embeddings are saved once the last
+                      batch has been consumed
+
+        Yields:
+            Arrays of shape (batch size, embedding_dim), in document order
+        """
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = self._embeddings_cache_path(Path(cache_dir), documents)
+            if cache_path.exists():
+                try:
+                    saved = np.load(cache_path, mmap_mode="r")
+                except (OSError, ValueError):
+                    pass  # Unreadable cache, embed from scratch
+                else:
+                    for i in range(0, len(documents), batch_size):
+                        yield saved[i : i + batch_size]
+                    return
+
+        computed = []
+        for embeddings in self._embed_batches(documents, batch_size):
+            if cache_path is not None:
+                computed.append(embeddings)
+            yield embeddings
+
+        if cache_path is not None and computed:
+            # Write to a temporary file first so a crash never leaves a truncated cache behind
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, np.concatenate(computed).astype(np.float16))
+            os.replace(tmp_path, cache_path)
+
+    def _embed_batches(self, documents: list[str], batch_size: int) -> Iterator[np.ndarray]:
+        """
+        Embed documents batch by batch, always working one batch ahead of the caller.
+
+        Large CPU-only corpora are spread across worker processes, since a single
+        model instance stops getting faster past a few torch threads. Otherwise a
+        background thread encodes the next batch while the current one is consumed.
+        """
+        batches = [documents[i : i + batch_size] for i in range(0, len(documents), batch_size)]
+        if not batches:
+            return
+
+        max_workers = min((os.cpu_count() or 1) // EMBED_WORKER_THREADS, MAX_EMBED_WORKERS)
+        on_cpu = self.encoder.device.type == "cpu"
+        if len(documents) > PARALLEL_EMBED_THRESHOLD and on_cpu and max_workers >= 2:
+            # Spawn rather than fork, since torch's thread pools aren't fork-safe
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embed_worker,
+                initargs=(EMBEDDING_MODEL_NAME, self.quantize),
+            ) as executor:
+                yield from executor.map(_embed_in_worker, batches, repeat(batch_size))
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="scripture-rag-embed"
+        ) as executor:
+            pending = executor.submit(self.embed, batches[0], batch_size)
+            for batch in batches[1:]:
+                embeddings = pending.result()
+                pending = executor.submit(self.embed, batch, batch_size)
+                yield embeddings
+            yield pending.result()
+
+    def _embeddings_cache_path(self, cache_dir: Path, documents: list[str]) -> Path:
+        """Path of the saved embeddings for these documents under the current model settings."""
+        digest = hashlib.sha256()
+        for document in documents:
+            digest.update(document.encode())
+            digest.update(b"\0")
+
+        model = EMBEDDING_MODEL_NAME.replace("/", "--")
+        if self.quantize:
+            model += "-int8"
+        return cache_dir / f"{model}_{digest.hexdigest()[:16]}.f16.npy"
+
+    def add_chunks(self, chunks: list[ScriptureChunk], batch_size: int = 256):
         """
         Add scripture chunks to the vector store.
 
         Args:
             chunks: List of ScriptureChunk objects to add
-            batch_size: Number of chunks to process in each batch
+            batch_size: Number of chunks to embed and insert in each batch
+        """
+        arrays = {
+            "texts": [chunk.text for chunk in chunks],
+            **{
+                column: [getattr(chunk, key) for chunk in chunks]
+                for key, column in METADATA_COLUMNS
+            },
+        }
+
+        self.add_chunks_soa(arrays, batch_size=batch_size)
+
+    def add_chunks_soa(
+        self,
+        arrays: dict[str, list],
+        batch_size: int = 256,
+        embeddings_cache_dir: str | Path | None = None,
+    ):
+        """
+        Add scripture verses stored as one list per ScriptureChunk field.
+
+        Metadata dictionaries are only built a batch at a time, right before the
+        batch is inserted.
+
+        Args:
+            arrays: Parallel "texts", "books", "prefixes", "chapters", "verses",
+                   "references", "section_headings" and "source_files" lists
+            batch_size: Number of verses to embed and insert in each batch
+            embeddings_cache_dir: Optional directory to reuse saved embeddings from
+        """
+        texts = arrays["texts"]
+        ids = [
+            f"{prefix}_{chapter}:{verse}"
+            for prefix, chapter, verse in zip(
+                arrays["prefixes"], arrays["chapters"], arrays["verses"]
+            )
+        ]
+        keys = [key for key, _ in METADATA_COLUMNS]
+        metadata_columns = [arrays[column] for _, column in METADATA_COLUMNS]
+
+        collection = self.get_or_create_collection()
+
+        # Cached query results may no longer be the best matches
+        self._clear_query_caches()
+
+        # Batches are embedded one ahead, so encoding overlaps with the inserts below
+        embedding_batches = self.iter_document_embeddings(
+            texts, batch_size=batch_size, cache_dir=embeddings_cache_dir
+        )
+
+        for batch_index, embeddings in enumerate(embedding_batches):
+            i = batch_index * batch_size
+            rows = zip(*(column[i : i + batch_size] for column in metadata_columns))
+            collection.add(
+                ids=ids[i : i + batch_size],
+                documents=texts[i : i + batch_size],
+                metadatas=[dict(zip(keys, row)) for row in rows],
+                embeddings=np.asarray(embeddings, dtype=np.float32),
+            )
+
+    def add_columns(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        batch_size: int = 256,
+        embeddings_cache_dir: str | Path | None = None,
+    ):
+        """
+        Add scripture verses stored as parallel columns to the vector store.
+
+        Embeddings are computed here and handed to Chroma batch by batch, so Chroma
+        doesn't re-embed the documents itself.
+
+        Args:
+            ids: Unique ID for each verse
+            documents: Verse texts
+            metadatas: Metadata dictionary for each verse
+            batch_size: Number of verses to embed and insert in each batch
+            embeddings_cache_dir: Optional directory to reuse saved embeddings from
         """
         collection = self.get_or_create_collection()
 
+        # Cached query results may no longer be the best matches
+        self._clear_query_caches()
+
+        # Batches are embedded one ahead, so encoding overlaps with the inserts below
+        embedding_batches = self.iter_document_embeddings(
+            documents, batch_size=batch_size, cache_dir=embeddings_cache_dir
+        )
+
         # Process in batches
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i : i + batch_size]
-
-            # Prepare data for ChromaDB
-            ids = [f"{chunk.prefix}_{chunk.chapter}:{chunk.verse}" for chunk in batch]
-            documents = [chunk.text for chunk in batch]
-            metadatas = [
-                {
-                    "book": chunk.book,
-                    "prefix": chunk.prefix,
-                    "chapter": chunk.chapter,
-                    "verse": chunk.verse,
-                    "reference": chunk.reference,
-                    "section_heading": chunk.section_heading,
-                    "source_file": chunk.source_file,
-                }
-                for chunk in batch
+        for batch_index, embeddings in enumerate(embedding_batches):
+            i = batch_index * batch_size
+            collection.add(
+                ids=ids[i : i + batch_size],
+                documents=documents[i : i + batch_size],
+                metadatas=metadatas[i : i + batch_size],
+                embeddings=np.asarray(embeddings, dtype=np.float32),
+            )
+
+    def embed_queries(self, query_texts: list[str]) -> np.ndarray:
+        """
+        Embed query texts, reusing embeddings of previously seen queries.
+
+        Embeddings are looked up in memory, then in the store's on-disk query
+        embedding cache. Queries found in neither are encoded together in one batch.
+
+        Args:
+            query_texts: Queries to embed
+
+        Returns:
+            Array of shape (len(query_texts), embedding_dim)
+        """
+        embeddings = [self.query_embedding_cache.get(text) for text in query_texts]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            keys = [self._query_embedding_key(query_texts[i]) for i in missing]
+            saved = self.query_embedding_disk_cache.get_many(keys)
+            for i, embedding in zip(missing, saved):
+                if embedding is not None:
+                    embeddings[i] = embedding
+                    self.query_embedding_cache.put(query_texts[i], embedding)
+
+            unsaved = [
+                (i, key) for i, key, embedding in zip(missing, keys, saved) if embedding is None
             ]
+            if unsaved:
+                new_embeddings = self.embed([query_texts[i] for i, _ in unsaved])
+                for (i, _), embedding in zip(unsaved, new_embeddings):
+                    embeddings[i] = embedding
+                    self.query_embedding_cache.put(query_texts[i], embedding)
+                self.query_embedding_disk_cache.put_many(
+                    (key, embedding) for (_, key), embedding in zip(unsaved, new_embeddings)
+                )
+
+        return np.vstack(embeddings)
 
-            # Add to collection
-            collection.add(ids=ids, documents=documents, metadatas=metadatas)
+    def _query_embedding_key(self, text: str) -> bytes:
+        """Key a query's saved embedding by the model that produced it and the text."""
+        return hashlib.sha256(f"{EMBEDDING_MODEL_NAME}\0{self.quantize}\0{text}".encode()).digest()
 
     def query(
-        self, query_text: str, n_results: int = 5, where: dict | None = None
+        self,
+        query_text: str,
+        n_results: int = 5,
+        where: dict | None = None,
+        query_embedding: np.ndarray | None = None,
+        include_embeddings: bool = False,
     ) -> dict[str, list[str | dict | float]]:
         """
         Query the vector store for relevant scripture passages.
@@ -97,25 +477,684 @@ class ScriptureVectorStore:
             query_text: The search query
             n_results: Number of results to return
             where: Optional metadata filter (e.g., {"book": "Alma"})
+            query_embedding: Precomputed embedding of query_text, if already available
+            include_embeddings: Whether to also return the stored embedding of each result
+
+        Near-duplicate queries with the same n_results and filter are answered from
+        the semantic cache without searching the collection.
 
         Returns:
             Dictionary containing:
             - documents: List of matching text passages
             - metadatas: List of metadata for each result
             - distances: List of distance scores (lower = more similar)
+            - embeddings: Array of result embeddings, only when include_embeddings is set
+        """
+        query_embeddings = None if query_embedding is None else [query_embedding]
+        return self.batch_query(
+            [query_text],
+            n_results=n_results,
+            where=where,
+            query_embeddings=query_embeddings,
+            include_embeddings=include_embeddings,
+        )[0]
+
+    def batch_query(
+        self,
+        query_texts: list[str],
+        n_results: int = 5,
+        where: dict | None = None,
+        query_embeddings: list[np.ndarray] | np.ndarray | None = None,
+        include_embeddings: bool = False,
+    ) -> list[dict[str, list[str | dict | float]]]:
+        """
+        Query the vector store with several queries at once.
+
+        The queries are embedded in one batch and every query that misses the
+        semantic cache is searched in a single collection query.
+
+        Args:
+            query_texts: The search queries
+            n_results: Number of results to return per query
+            where: Optional metadata filter applied to every query
+            query_embeddings: Precomputed embeddings of query_texts, if already available
+            include_embeddings: Whether to also return the stored embedding of each result
+
+        Returns:
+            One results dictionary per query, in the same format as query()
+        """
+        match_count = self._filter_count(where)
+        if match_count == 0:
+            return [self._empty_results(include_embeddings) for _ in query_texts]
+
+        if query_embeddings is None:
+            query_embeddings = self.embed_queries(query_texts)
+        cache_namespace = (n_results, json.dumps(where, sort_keys=True), include_embeddings)
+
+        results_list = [
+            self.query_cache.get(embedding, cache_namespace) for embedding in query_embeddings
+        ]
+        missing = [i for i, results in enumerate(results_list) if results is None]
+        if not missing:
+            return results_list
+
+        if where is not None and match_count <= self.brute_force_limit:
+            # HNSW has to step over verses the filter rejects, and loses recall when
+            # few match, so search small filtered subsets exhaustively instead
+            results = self._filter_subset(where).query(
+                [query_embeddings[i] for i in missing], n_results, include_embeddings
+            )
+        else:
+            collection = self.get_or_create_collection()
+
+            include = ["documents", "metadatas", "distances"]
+            if include_embeddings:
+                include.append("embeddings")
+
+            # Pass the embeddings we already computed so Chroma doesn't embed the texts again
+            results = collection.query(
+                query_embeddings=[query_embeddings[i] for i in missing],
+                n_results=n_results,
+                where=where,
+                include=include,
+            )
+
+        # Split the batched results (ChromaDB returns one nested list per query)
+        for position, i in enumerate(missing):
+            flattened = {
+                "documents": results["documents"][position] if results["documents"] else [],
+                "metadatas": results["metadatas"][position] if results["metadatas"] else [],
+                "distances": results["distances"][position] if results["distances"] else [],
+            }
+            if include_embeddings:
+                flattened["embeddings"] = np.asarray(results["embeddings"][position])
+            self.query_cache.put(query_embeddings[i], flattened, cache_namespace)
+            results_list[i] = flattened
+
+        return results_list
+
+    def count(self, where: dict | None = None) -> int:
+        """
+        Get the number of chunks in the collection.
+
+        Args:
+            where: Optional metadata filter; only chunks matching it are counted
+
+        Returns:
+            Number of (matching) chunks
         """
         collection = self.get_or_create_collection()
+        if where is None:
+            return collection.count()
+        return len(collection.get(where=where, include=[])["ids"])
+
+    def _filter_count(self, where: dict | None) -> int:
+        """Number of chunks matching the filter, remembered until the collection changes."""
+        total = self.count()
+        if total != self._collection_count:
+            # Verses were added or removed since the cached results were computed,
+            # possibly by another store on the same directory
+            self._clear_query_caches()
+            self._collection_count = total
+        if where is None or total == 0:
+            return total
+
+        key = json.dumps(where, sort_keys=True)
+        count = self._filter_counts.get(key)
+        if count is None:
+            count = self.count(where)
+            self._filter_counts.put(key, count)
+        return count
+
+    def _filter_subset(self, where: dict) -> "_ExactSubset":
+        """Load the chunks matching a filter for exact search, reusing recent subsets."""
+        key = json.dumps(where, sort_keys=True)
+        subset = self._filter_subsets.get(key)
+        if subset is None:
+            verses = self.get_or_create_collection().get(
+                where=where, include=["documents", "metadatas", "embeddings"]
+            )
+            subset = _ExactSubset(verses["documents"], verses["metadatas"], verses["embeddings"])
+            self._filter_subsets.put(key, subset)
+        return subset
 
-        results = collection.query(query_texts=[query_text], n_results=n_results, where=where)
+    def _clear_query_caches(self):
+        """Forget cached results and filter statistics once the collection changes."""
+        self.query_cache.clear()
+        self._filter_counts.clear()
+        self._filter_subsets.clear()
 
-        # Flatten the results (ChromaDB returns nested lists for batch queries)
+    def _empty_results(self, include_embeddings: bool) -> dict[str, list | np.ndarray]:
+        """Build the results of a query that matched nothing."""
+        results = {"documents": [], "metadatas": [], "distances": []}
+        if include_embeddings:
+            dimension = self.encoder.get_sentence_embedding_dimension()
+            results["embeddings"] = np.empty((0, dimension), dtype=np.float32)
+        return results
+
+
+class _ExactSubset:
+    """A small, non-empty set of verses held in memory and searched exhaustively."""
+
+    def __init__(self, documents: list[str], metadatas: list[dict], embeddings):
+        """
+        Hold the verses matching a filter.
+
+        Args:
+            documents: Verse texts
+            metadatas: Metadata dictionary for each verse
+            embeddings: Stored embedding of each verse, one row each
+        """
+        self.documents = documents
+        self.metadatas = metadatas
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self._squared_norms = np.einsum("ij,ij->i", self.embeddings, self.embeddings)
+
+    def query(
+        self, query_embeddings: list[np.ndarray], n_results: int, include_embeddings: bool
+    ) -> dict[str, list[list]]:
+        """
+        Find the nearest verses to each query embedding.
+
+        Args:
+            query_embeddings: Query embeddings
+            n_results: Number of results per query
+            include_embeddings: Whether to also return each result's stored embedding
+
+        Returns:
+            Nested "documents", "metadatas" and "distances" lists in Chroma's shape,
+            with squared L2 distances as in Chroma's default space
+        """
+        queries = np.vstack(query_embeddings).astype(np.float32, copy=False)
+        distances = (
+            np.einsum("ij,ij->i", queries, queries)[:, None]
+            + self._squared_norms
+            - 2.0 * (queries @ self.embeddings.T)
+        )
+        n_results = min(n_results, len(self.documents))
+
+        results = {"documents": [], "metadatas": [], "distances": []}
+        if include_embeddings:
+            results["embeddings"] = []
+        for query_distances in distances:
+            nearest = np.argsort(query_distances, kind="stable")[:n_results]
+            rows = nearest.tolist()
+            results["documents"].append([self.documents[row] for row in rows])
+            results["metadatas"].append([self.metadatas[row] for row in rows])
+            results["distances"].append(query_distances[nearest].tolist())
+            if include_embeddings:
+                results["embeddings"].append(self.embeddings[nearest])
+
+        return results
+
+
+@functools.lru_cache(maxsize=None)
+def _load_encoder(model_name: str, quantize: bool) -> SentenceTransformer:
+    """
+    Load a sentence-transformers model once per process and quantization setting.
+
+    Quantization modifies the model in place, so quantized and full-precision
+    models are cached separately.
+    """
+    encoder = SentenceTransformer(model_name, device="cpu")
+    if quantize:
+        quantize_dynamic_int8(encoder)
+    return encoder
+
+
+class _EncoderEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Chroma embedding function backed by the vector store's own SentenceTransformer.
+
+    It reports itself as Chroma's sentence-transformers function with the same
+    config, so collections created with that function open without a conflict.
+    """
+
+    def __init__(self, encoder: SentenceTransformer, model_name: str):
+        self.encoder = encoder
+        self.model_name = model_name
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = self.encoder.encode(
+            list(input), convert_to_numpy=True, show_progress_bar=False
+        )
+        return [np.asarray(embedding, dtype=np.float32) for embedding in embeddings]
+
+    @staticmethod
+    def name() -> str:
+        return embedding_functions.SentenceTransformerEmbeddingFunction.name()
+
+    def get_config(self) -> dict:
         return {
-            "documents": results["documents"][0] if results["documents"] else [],
-            "metadatas": results["metadatas"][0] if results["metadatas"] else [],
-            "distances": results["distances"][0] if results["distances"] else [],
+            "model_name": self.model_name,
+            "device": self.encoder.device.type,
+            "normalize_embeddings": False,
+            "kwargs": {},
         }
 
-    def count(self) -> int:
-        """Get the number of chunks in the collection."""
+    def is_legacy(self) -> bool:
+        # Chroma's default check builds a second instance from the config, which
+        # would load another copy of the model
+        return False
+
+    @staticmethod
+    def build_from_config(config: dict) -> EmbeddingFunction[Documents]:
+        model_name = config["model_name"]
+        return _EncoderEmbeddingFunction(_load_encoder(model_name, False), model_name)
+
+    @staticmethod
+    def validate_config(config: dict) -> None:
+        embedding_functions.SentenceTransformerEmbeddingFunction.validate_config(config)
+
+
+_worker_model: SentenceTransformer | None = None
+
+
+def _init_embed_worker(model_name: str, quantize: bool) -> None:
+    """Load a private copy of the embedding model in a worker process."""
+    global _worker_model
+    torch.set_num_threads(EMBED_WORKER_THREADS)
+    _worker_model = SentenceTransformer(model_name, device="cpu")
+    if quantize:
+        quantize_dynamic_int8(_worker_model)
+
+
+def _embed_in_worker(texts: list[str], batch_size: int) -> np.ndarray:
+    """Embed one shard of the corpus inside a worker process."""
+    return _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+
+
+class FaissScriptureVectorStore(ScriptureVectorStore):
+    """
+    Keeps scripture embeddings in an exact FAISS inner-product index.
+
+    For a corpus the size of the standard works (~41k verses), a flat scan over
+    normalized embeddings is faster than walking an HNSW graph and still fits
+    comfortably in memory. Documents and metadata live in a SQLite table keyed by
+    each verse's row in the index. Requires the faiss-cpu package.
+
+    Embeddings can also be stored as int8 (4x smaller) or as sign bits (32x smaller,
+    searched by Hamming distance and rescored against the full-precision query).
+    """
+
+    DEFAULT_DIRECTORY = "faiss"
+
+    def __init__(
+        self,
+        persist_directory: str | Path | None = None,
+        quantize: bool = False,
+        cache_size: int = 512,
+        cache_threshold: float = 1.0,
+        precision: str = "float32",
+    ):
+        """
+        Initialize the vector store.
+
+        Args:
+            persist_directory: Directory to persist the index and verse table.
+                             Defaults to ~/.scripture-rag/faiss
+            quantize: Whether to quantize the embedding model to int8 for CPU inference
+            cache_size: Number of query results kept in the semantic cache (0 disables it)
+            cache_threshold: Cosine similarity at which a new query reuses the results
+                            cached for an earlier one. The default of 1.0 only reuses
+                            results for the same query; lower values also match
+                            near-duplicates
+            precision: How embeddings are stored in the index, one of "float32",
+                      "int8" or "binary". Each precision is kept in its own index files
+        """
+        if precision not in EMBEDDING_PRECISIONS:
+            raise ValueError(f"Unknown embedding precision: {precision}")
+
+        # The FAISS index is already searched exactly, restricted to a filter's rows
+        super().__init__(
+            persist_directory,
+            quantize=quantize,
+            cache_size=cache_size,
+            cache_threshold=cache_threshold,
+            brute_force_limit=0,
+        )
+        self.precision = precision
+        self.collection_name = "scriptures" if precision == "float32" else f"scriptures-{precision}"
+        self._collection: _FaissCollection | None = None
+
+    def _open_client(self):
+        """Nothing to connect to; the index files are opened by get_or_create_collection."""
+
+    def get_or_create_collection(self) -> "_FaissCollection":
+        """Open the scriptures index, loading it from disk on first use."""
+        if self._collection is None:
+            self._collection = _FaissCollection(
+                self.persist_directory / f"{self.collection_name}.faiss",
+                self.persist_directory / f"{self.collection_name}.sqlite3",
+                self.encoder.get_sentence_embedding_dimension(),
+                self.precision,
+            )
+        return self._collection
+
+    def clear_collection(self) -> "_FaissCollection":
+        """Remove every verse from the index (useful for re-indexing)."""
+        collection = self.get_or_create_collection()
+        collection.clear()
+        self._clear_query_caches()
+        return collection
+
+    def iter_document_embeddings(
+        self,
+        documents: list[str],
+        batch_size: int = 256,
+        cache_dir: str | Path | None = None,
+    ) -> Iterator[np.ndarray]:
+        """Yield embeddings by batch, calibrating an untrained int8 index on all of them first."""
+        embedding_batches = super().iter_document_embeddings(
+            documents, batch_size=batch_size, cache_dir=cache_dir
+        )
+        collection = self.get_or_create_collection()
+        if collection.index.is_trained:
+            yield from embedding_batches
+            return
+
+        embedding_batches = list(embedding_batches)
+        if embedding_batches:
+            collection.train(np.concatenate(embedding_batches))
+        yield from embedding_batches
+
+    def count(self, where: dict | None = None) -> int:
+        """Get the number of verses in the index, optionally only those matching a filter."""
         collection = self.get_or_create_collection()
-        return collection.count()
+        if where is None:
+            return collection.count()
+        return collection.count_matching(where)
+
+    def add_chunks_soa(
+        self,
+        arrays: dict[str, list],
+        batch_size: int = 256,
+        embeddings_cache_dir: str | Path | None = None,
+    ):
+        """Add verses stored as one list per field, then save the index."""
+        super().add_chunks_soa(
+            arrays, batch_size=batch_size, embeddings_cache_dir=embeddings_cache_dir
+        )
+        self.get_or_create_collection().save()
+
+    def add_columns(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        batch_size: int = 256,
+        embeddings_cache_dir: str | Path | None = None,
+    ):
+        """Add verses stored as parallel columns, then save the index."""
+        super().add_columns(
+            ids,
+            documents,
+            metadatas,
+            batch_size=batch_size,
+            embeddings_cache_dir=embeddings_cache_dir,
+        )
+        self.get_or_create_collection().save()
+
+
+class _FaissCollection:
+    """A FAISS index and SQLite verse table with the parts of Chroma's collection API we use."""
+
+    def __init__(self, index_path: Path, db_path: Path, dimension: int, precision: str):
+        """
+        Open or create the index and verse table.
+
+        Args:
+            index_path: File the FAISS index is saved to
+            db_path: SQLite database holding documents and metadata
+            dimension: Embedding dimension
+            precision: How embeddings are stored, one of EMBEDDING_PRECISIONS
+        """
+        try:
+            import faiss
+        except ImportError as e:
+            raise ImportError(
+                "The FAISS vector store requires faiss-cpu (pip install 'scripture-rag[faiss]')"
+            ) from e
+
+        self._faiss = faiss
+        self.index_path = index_path
+        self.dimension = dimension
+        self.precision = precision
+
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verses ("
+            "row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, "
+            "document TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+
+        if index_path.exists():
+            if precision == "binary":
+                self.index = faiss.read_index_binary(str(index_path))
+            else:
+                self.index = faiss.read_index(str(index_path))
+        elif precision == "binary":
+            self.index = faiss.IndexBinaryFlat(dimension)
+        elif precision == "int8":
+            self.index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            self.index = faiss.IndexFlatIP(dimension)
+
+    def train(self, embeddings: np.ndarray):
+        """Fit the int8 quantizer's per-dimension ranges, if it hasn't been already."""
+        if not self.index.is_trained:
+            self.index.train(np.ascontiguousarray(embeddings, dtype=np.float32))
+
+    def add(
+        self,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        embeddings: np.ndarray,
+    ):
+        """Append verses and their (normalized) embeddings to the index."""
+        start = self.index.ntotal
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO verses (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                zip(
+                    range(start, start + len(ids)),
+                    ids,
+                    documents,
+                    (json.dumps(metadata) for metadata in metadatas),
+                ),
+            )
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.train(embeddings)
+        if self.precision == "binary":
+            embeddings = np.packbits(embeddings > 0, axis=1)
+        self.index.add(embeddings)
+
+    def query(
+        self,
+        query_embeddings: list[np.ndarray],
+        n_results: int,
+        where: dict | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, list[list]]:
+        """
+        Find the nearest verses to each query embedding.
+
+        Args:
+            query_embeddings: Normalized query embeddings
+            n_results: Number of results per query
+            where: Optional metadata filter, either {"key": value} or
+                  {"key": {"$in": [values]}}
+            include: Fields to return; "embeddings" adds the stored (possibly
+                    dequantized) embedding of each result
+
+        Returns:
+            Nested "documents", "metadatas" and "distances" lists in Chroma's shape.
+            Distances are squared L2 distances between the normalized embeddings
+        """
+        include_embeddings = include is not None and "embeddings" in include
+        queries = np.ascontiguousarray(np.vstack(query_embeddings), dtype=np.float32)
+        params = None
+        if where is not None:
+            rows = np.fromiter(
+                (row for (row,) in self.db.execute(*_where_sql(where))), dtype=np.int64
+            )
+            params = self._faiss.SearchParameters(sel=self._faiss.IDSelectorBatch(rows))
+            n_results = min(n_results, len(rows))
+        n_results = min(n_results, self.index.ntotal)
+
+        results = {"documents": [], "metadatas": [], "distances": []}
+        if include_embeddings:
+            results["embeddings"] = []
+        if n_results == 0:
+            for values in results.values():
+                values.extend([] for _ in queries)
+            return results
+
+        similarities, rows = self._search(queries, n_results, params)
+
+        for query_similarities, query_rows in zip(similarities, rows):
+            found = query_rows >= 0
+            query_rows = query_rows[found].tolist()
+
+            placeholders = ", ".join("?" * len(query_rows))
+            verses = {
+                row: (document, metadata)
+                for row, document, metadata in self.db.execute(
+                    f"SELECT row, document, metadata FROM verses WHERE row IN ({placeholders})",
+                    query_rows,
+                )
+            }
+
+            results["documents"].append([verses[row][0] for row in query_rows])
+            results["metadatas"].append([json.loads(verses[row][1]) for row in query_rows])
+            # |a - b|^2 = 2 - 2(a . b) for unit vectors, matching Chroma's default l2 space
+            results["distances"].append((2.0 - 2.0 * query_similarities[found]).tolist())
+            if include_embeddings:
+                results["embeddings"].append(self._reconstruct(query_rows))
+
+        return results
+
+    def _search(self, queries: np.ndarray, n_results: int, params) -> tuple[np.ndarray, np.ndarray]:
+        """Return (similarities, rows) of the nearest verses, with -1 rows for missing hits."""
+        if self.precision != "binary":
+            return self.index.search(queries, n_results, params=params)
+
+        # Find candidates by Hamming distance between sign bits, then rank them by the
+        # dot product of the float query with the candidates' +/-1 vectors
+        n_candidates = min(n_results * BINARY_RESCORE_MULTIPLIER, self.index.ntotal)
+        _, candidates = self.index.search(
+            np.packbits(queries > 0, axis=1), n_candidates, params=params
+        )
+
+        similarities = np.full((len(queries), n_results), -np.inf, dtype=np.float32)
+        rows = np.full((len(queries), n_results), -1, dtype=np.int64)
+        for q, (query, query_candidates) in enumerate(zip(queries, candidates)):
+            query_candidates = query_candidates[query_candidates >= 0]
+            if len(query_candidates) == 0:
+                continue
+
+            codes = np.vstack([self.index.reconstruct(int(row)) for row in query_candidates])
+            signs = np.unpackbits(codes, axis=1, count=self.dimension).astype(np.float32) * 2 - 1
+            scores = signs @ query / np.sqrt(self.dimension)
+
+            best = np.argsort(-scores)[:n_results]
+            similarities[q, : len(best)] = scores[best]
+            rows[q, : len(best)] = query_candidates[best]
+
+        return similarities, rows
+
+    def _reconstruct(self, rows: list[int]) -> np.ndarray:
+        """Return the stored embeddings of the given rows as float32 vectors."""
+        if not rows:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        vectors = np.vstack([self.index.reconstruct(row) for row in rows])
+        if self.precision == "binary":
+            signs = np.unpackbits(vectors, axis=1, count=self.dimension).astype(np.float32)
+            return (signs * 2 - 1) / np.sqrt(self.dimension)
+        return vectors.astype(np.float32)
+
+    def count(self) -> int:
+        """Number of verses in the index."""
+        return self.index.ntotal
+
+    def count_matching(self, where: dict) -> int:
+        """Number of verses whose metadata matches the filter."""
+        sql, params = _where_sql(where)
+        ((count,),) = self.db.execute(f"SELECT COUNT(*) FROM ({sql})", params)
+        return count
+
+    def clear(self):
+        """Remove every verse from the index and table."""
+        self.index.reset()
+        with self.db:
+            self.db.execute("DELETE FROM verses")
+        self.index_path.unlink(missing_ok=True)
+
+    def save(self):
+        """Write the index to disk."""
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        if self.precision == "binary":
+            self._faiss.write_index_binary(self.index, str(tmp_path))
+        else:
+            self._faiss.write_index(self.index, str(tmp_path))
+        os.replace(tmp_path, self.index_path)
+
+
+def _where_sql(where: dict) -> tuple[str, list]:
+    """Translate a single-key Chroma-style metadata filter into a SQLite row query."""
+    if len(where) != 1:
+        raise ValueError(f"Unsupported metadata filter: {where}")
+
+    ((key, condition),) = where.items()
+    path = f"$.{key}"
+    if isinstance(condition, dict):
+        if set(condition) != {"$in"}:
+            raise ValueError(f"Unsupported metadata filter: {where}")
+        values = list(condition["$in"])
+        placeholders = ", ".join("?" * len(values))
+        return (
+            f"SELECT row FROM verses WHERE json_extract(metadata, ?) IN ({placeholders})",
+            [path, *values],
+        )
+
+    return "SELECT row FROM verses WHERE json_extract(metadata, ?) = ?", [path, condition]
+
+
+def create_vector_store(
+    backend: str = "chroma",
+    persist_directory: str | Path | None = None,
+    precision: str = "float32",
+    **kwargs,
+) -> ScriptureVectorStore:
+    """
+    Create a vector store for the given backend.
+
+    Args:
+        backend: "chroma" for ChromaDB's HNSW index or "faiss" for an exact FAISS index
+        persist_directory: Directory to persist the store. Defaults to a per-backend
+                         directory under ~/.scripture-rag
+        precision: How the FAISS store keeps embeddings. Chroma only stores float32
+        **kwargs: Passed through to the store's constructor
+
+    Returns:
+        The vector store
+    """
+    if backend == "chroma":
+        if precision != "float32":
+            raise ValueError("The chroma vector store only supports float32 embeddings")
+        return ScriptureVectorStore(persist_directory=persist_directory, **kwargs)
+    if backend == "faiss":
+        return FaissScriptureVectorStore(
+            persist_directory=persist_directory, precision=precision, **kwargs
+        )
+    raise ValueError(f"Unknown vector store backend: {backend}")
@@ -8,6 +8,16 @@ from scripture_rag.parser import ScriptureChunk
 
 
 @pytest.fixture
+def clear_shared_rerankers():
+    """Keep a reranker shared under one test's mocks from leaking into the next."""
+    from scripture_rag import reranker
+
+    reranker._shared_reranker.cache_clear()
+    yield
+    reranker._shared_reranker.cache_clear()
+
+
+@pytest.fixture(scope="session")
 def sample_scripture_content():
     """Sample scripture text content for testing."""
     return """RTH 1:0 Ruth and Naomi
@@ -26,7 +36,7 @@ JON 1:2 Arise, go to Nineveh, that great city, and cry against it; for their wic
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_contents_txt():
     """Sample Contents.txt content for testing."""
     return """               TABLE OF CONTENTS I
@@ -44,6 +54,12 @@ Jonah . . . . . . . . . . . . . . . . . . .   JON
 """
 
 
+@pytest.fixture(scope="session")
+def sample_contents_lines(sample_contents_txt):
+    """Sample Contents.txt content split into lines, as a tuple so tests can't modify it."""
+    return tuple(sample_contents_txt.splitlines())
+
+
 @pytest.fixture
 def temp_scripture_file(tmp_path, sample_scripture_content):
     """Create a temporary scripture file for testing."""
@@ -93,7 +109,7 @@ Jonah . . . . . . . . . . . . . . . . . . .   JON
 
 @pytest.fixture
 def sample_book_mapping():
-    """Sample book abbreviation to full name mapping."""
+    """Sample book abbreviation to full name mapping, built fresh for each test."""
     return {
         "GEN": "Genesis",
         "EXO": "Exodus",
@@ -4,7 +4,11 @@ from pathlib import Path
 
 import pytest
 
-from scripture_rag.book_mapping import get_default_mapping, load_book_mapping
+from scripture_rag.book_mapping import (
+    get_default_mapping,
+    load_book_mapping,
+    parse_book_mapping,
+)
 
 
 class TestLoadBookMapping:
@@ -57,38 +61,73 @@ class TestLoadBookMapping:
 
         assert "Contents file not found" in str(exc_info.value)
 
-    def test_load_book_mapping_empty_lines_ignored(self, tmp_path):
+    def test_load_book_mapping_empty_file(self, tmp_path):
+        """Test loading an empty Contents.txt file."""
+        contents_file = tmp_path / "Contents.txt"
+        contents_file.write_text("")
+
+        mapping = load_book_mapping(contents_file)
+        assert mapping == {}
+
+    def test_load_book_mapping_returns_independent_copies(self, temp_contents_file):
+        """Test that mutating a returned mapping doesn't affect later calls."""
+        mapping1 = load_book_mapping(temp_contents_file)
+        mapping1["GEN"] = "Changed"
+
+        mapping2 = load_book_mapping(temp_contents_file)
+        assert mapping2["GEN"] == "Genesis"
+
+    def test_load_book_mapping_reloads_when_file_changes(self, tmp_path):
+        """Test that the cached mapping is invalidated when the file changes."""
+        contents_file = tmp_path / "Contents.txt"
+        contents_file.write_text("Genesis   . . . . . . . . . . . . . . . . .   GEN\n")
+        assert load_book_mapping(contents_file) == {"GEN": "Genesis"}
+
+        contents_file.write_text(
+            "Genesis   . . . . . . . . . . . . . . . . .   GEN\n"
+            "Ruth  . . . . . . . . . . . . . . . . . . .   RTH\n"
+        )
+        assert load_book_mapping(contents_file) == {"GEN": "Genesis", "RTH": "Ruth"}
+
+
+class TestParseBookMapping:
+    """Tests for parse_book_mapping function."""
+
+    def test_parse_book_mapping_matches_file(
+        self, temp_contents_file, sample_contents_txt, sample_contents_lines
+    ):
+        """Test that parsing text gives the same mapping as loading the file."""
+        mapping = parse_book_mapping(sample_contents_txt)
+
+        assert mapping == load_book_mapping(temp_contents_file)
+        assert mapping == parse_book_mapping("\n".join(sample_contents_lines))
+
+    def test_parse_book_mapping_empty_lines_ignored(self):
         """Test that empty lines are ignored."""
         contents = """Genesis   . . . . . . . . . . . . . . . . .   GEN
 
 Ruth  . . . . . . . . . . . . . . . . . . .   RTH
 
 """
-        contents_file = tmp_path / "Contents.txt"
-        contents_file.write_text(contents)
-
-        mapping = load_book_mapping(contents_file)
+        mapping = parse_book_mapping(contents)
         assert mapping["GEN"] == "Genesis"
         assert mapping["RTH"] == "Ruth"
         assert len(mapping) == 2
 
-    def test_load_book_mapping_malformed_lines_ignored(self, tmp_path):
+    def test_parse_book_mapping_malformed_lines_ignored(self):
         """Test that malformed lines are skipped."""
         contents = """Genesis   . . . . . . . . . . . . . . . . .   GEN
 This is a malformed line without proper format
 Ruth  . . . . . . . . . . . . . . . . . . .   RTH
 Another bad line
 """
-        contents_file = tmp_path / "Contents.txt"
-        contents_file.write_text(contents)
-
-        mapping = load_book_mapping(contents_file)
+        mapping = parse_book_mapping(contents)
         assert mapping["GEN"] == "Genesis"
         assert mapping["RTH"] == "Ruth"
         # Should only have the two valid mappings
         assert len(mapping) == 2
 
-    def test_load_book_mapping_header_lines_ignored(self, tmp_path):
+    def test_parse_book_mapping_header_lines_ignored(self):
         """Test that header lines are ignored."""
         contents = """               TABLE OF CONTENTS I
              In order of appearance
@@ -97,21 +136,14 @@ Another bad line
 
 Genesis   . . . . . . . . . . . . . . . . .   GEN
 """
-        contents_file = tmp_path / "Contents.txt"
-        contents_file.write_text(contents)
-
-        mapping = load_book_mapping(contents_file)
+        mapping = parse_book_mapping(contents)
         # Should only have Genesis, not the header lines
         assert len(mapping) == 1
         assert mapping["GEN"] == "Genesis"
 
-    def test_load_book_mapping_empty_file(self, tmp_path):
-        """Test loading an empty Contents.txt file."""
-        contents_file = tmp_path / "Contents.txt"
-        contents_file.write_text("")
-
-        mapping = load_book_mapping(contents_file)
-        assert mapping == {}
+    def test_parse_book_mapping_empty_text(self):
+        """Test parsing empty Contents.txt text."""
+        assert parse_book_mapping("") == {}
 
 
 class TestGetDefaultMapping:
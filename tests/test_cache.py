@@ -0,0 +1,158 @@
+"""Tests for the query, result and score caches."""
+
+import numpy as np
+
+from scripture_rag.cache import EmbeddingDiskCache, SemanticCache, TTLCache
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache class."""
+
+    def test_get_empty_cache(self):
+        """Test that lookups on an empty cache miss."""
+        cache = SemanticCache()
+
+        assert cache.get(np.array([1.0, 0.0])) is None
+        assert len(cache) == 0
+
+    def test_get_near_duplicate_embedding(self):
+        """Test that a sufficiently similar embedding hits."""
+        cache = SemanticCache(threshold=0.99)
+        cache.put(np.array([1.0, 0.0]), "value")
+
+        assert cache.get(np.array([2.0, 0.01])) == "value"
+        assert cache.get(np.array([1.0, 1.0])) is None
+
+    def test_default_matches_exact_embedding_only(self):
+        """Test that by default only the same embedding hits."""
+        cache = SemanticCache()
+        embedding = np.array([0.3, 0.5, 0.8])
+        cache.put(embedding, "value")
+
+        assert cache.get(embedding.copy()) == "value"
+        assert cache.get(np.array([0.3, 0.5, 0.80001])) is None
+
+    def test_default_distinct_queries_do_not_collide(self):
+        """Test that distinct but highly similar embeddings keep separate entries."""
+        rng = np.random.default_rng(0)
+        base = rng.standard_normal(768)
+        embeddings = [base + rng.standard_normal(768) * 0.01 for _ in range(20)]
+
+        cache = SemanticCache()
+        for i, embedding in enumerate(embeddings):
+            assert cache.get(embedding) is None
+            cache.put(embedding, i)
+
+        assert len(cache) == 20
+        assert [cache.get(embedding) for embedding in embeddings] == list(range(20))
+
+    def test_get_respects_namespace(self):
+        """Test that entries only match within their namespace."""
+        cache = SemanticCache()
+        cache.put(np.array([1.0, 0.0]), "five", namespace=5)
+
+        assert cache.get(np.array([1.0, 0.0]), namespace=5) == "five"
+        assert cache.get(np.array([1.0, 0.0]), namespace=10) is None
+
+    def test_put_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = SemanticCache(max_size=2)
+        cache.put(np.array([1.0, 0.0, 0.0]), "a")
+        cache.put(np.array([0.0, 1.0, 0.0]), "b")
+
+        # Touch "a" so "b" becomes the eviction candidate
+        assert cache.get(np.array([1.0, 0.0, 0.0])) == "a"
+        cache.put(np.array([0.0, 0.0, 1.0]), "c")
+
+        assert len(cache) == 2
+        assert cache.get(np.array([1.0, 0.0, 0.0])) == "a"
+        assert cache.get(np.array([0.0, 1.0, 0.0])) is None
+        assert cache.get(np.array([0.0, 0.0, 1.0])) == "c"
+
+    def test_clear(self):
+        """Test that clear removes all entries."""
+        cache = SemanticCache()
+        cache.put(np.array([1.0, 0.0]), "value")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get(np.array([1.0, 0.0])) is None
+
+
+class TestTTLCache:
+    """Tests for TTLCache class."""
+
+    def test_put_and_get(self):
+        """Test storing and retrieving a value."""
+        cache = TTLCache()
+        cache.put("key", 1.5)
+
+        assert cache.get("key") == 1.5
+        assert cache.get("missing") is None
+
+    def test_get_expired_entry(self, mocker):
+        """Test that entries expire after the TTL."""
+        mock_monotonic = mocker.patch("scripture_rag.cache.time.monotonic", return_value=100.0)
+        cache = TTLCache(ttl=10.0)
+        cache.put("key", 1.5)
+
+        mock_monotonic.return_value = 105.0
+        assert cache.get("key") == 1.5
+
+        mock_monotonic.return_value = 111.0
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_put_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestEmbeddingDiskCache:
+    """Tests for EmbeddingDiskCache class."""
+
+    def test_put_and_get_many(self, tmp_path):
+        """Test storing embeddings and looking them up with missing keys mixed in."""
+        cache = EmbeddingDiskCache(tmp_path / "embeddings.sqlite3")
+        cache.put_many([(b"a", np.array([1.0, 2.0])), (b"b", np.array([3.0, 4.0]))])
+
+        a, missing, b = cache.get_many([b"a", b"missing", b"b"])
+
+        np.testing.assert_array_equal(a, [1.0, 2.0])
+        assert a.dtype == np.float32
+        assert missing is None
+        np.testing.assert_array_equal(b, [3.0, 4.0])
+
+    def test_persists_between_instances(self, tmp_path):
+        """Test that embeddings stored by one cache are read back by another."""
+        path = tmp_path / "embeddings.sqlite3"
+        EmbeddingDiskCache(path).put_many([(b"key", np.array([0.5, 0.25]))])
+
+        (embedding,) = EmbeddingDiskCache(path).get_many([b"key"])
+
+        np.testing.assert_array_equal(embedding, [0.5, 0.25])
+
+    def test_put_evicts_oldest(self, tmp_path):
+        """Test that the oldest entries are deleted once the cache is full."""
+        cache = EmbeddingDiskCache(tmp_path / "embeddings.sqlite3", max_size=2)
+        for key in (b"a", b"b", b"c"):
+            cache.put_many([(key, np.array([1.0]))])
+
+        assert len(cache) == 2
+        assert cache.get_many([b"a"]) == [None]
+        assert cache.get_many([b"c"])[0] is not None
+
+    def test_disabled(self, tmp_path):
+        """Test that a max_size of 0 stores nothing."""
+        cache = EmbeddingDiskCache(tmp_path / "embeddings.sqlite3", max_size=0)
+        cache.put_many([(b"a", np.array([1.0]))])
+
+        assert len(cache) == 0
@@ -2,15 +2,19 @@
 
 import shutil
 import zipfile
+import zlib
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import requests
 
 from scripture_rag.downloader import (
+    DOWNLOAD_CHUNK_SIZE,
     SCRIPTURE_URLS,
     UNWANTED_FILES,
+    _materialize,
+    _shared_session,
     add_txt_extension,
     download_file,
     ensure_assets_downloaded,
@@ -20,22 +24,43 @@ from scripture_rag.downloader import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_session():
+    """Keep a session created under one test's mocks from leaking into the next."""
+    _shared_session.cache_clear()
+    yield
+    _shared_session.cache_clear()
+
+
+@pytest.fixture
+def mock_create_session():
+    """Patch create_session_with_retries to build a requests.Session spec mock."""
+    with patch("scripture_rag.downloader.create_session_with_retries") as mock_create:
+        mock_create.return_value = Mock(spec=requests.Session)
+        yield mock_create
+
+
+@pytest.fixture
+def mock_session(mock_create_session):
+    """The session mock that downloads use by default."""
+    return mock_create_session.return_value
+
+
+def streaming_response(chunks, headers=None):
+    """Build a streamed response mock that yields the given byte chunks."""
+    response = Mock(spec=requests.Response)
+    response.headers = headers or {}
+    response.iter_content.return_value = chunks
+    return response
+
+
 class TestDownloadFile:
     """Tests for download_file function."""
 
-    @patch("scripture_rag.downloader.create_session_with_retries")
-    def test_download_file_success(self, mock_create_session, tmp_path):
+    def test_download_file_success(self, mock_session, tmp_path):
         """Test successful file download."""
-        # Create mock response with streaming support
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.iter_content = MagicMock(return_value=[b"test content"])
-
-        # Create mock session
-        mock_session = MagicMock()
+        mock_response = streaming_response([b"test content"])
         mock_session.get.return_value = mock_response
-        mock_create_session.return_value = mock_session
 
         dest_path = tmp_path / "test.zip"
         download_file("https://example.com/test.zip", dest_path)
@@ -45,20 +70,112 @@ class TestDownloadFile:
         mock_session.get.assert_called_once_with(
             "https://example.com/test.zip", timeout=60, stream=True, verify=False
         )
+        mock_response.iter_content.assert_called_once_with(chunk_size=1 << 20)
+
+    def test_download_file_reuses_session(self, mock_create_session, mock_session, tmp_path):
+        """Test that downloads without an explicit session share one session."""
+        mock_session.get.side_effect = lambda *args, **kwargs: streaming_response([b"content"])
+
+        download_file("https://example.com/a.zip", tmp_path / "a.zip")
+        download_file("https://example.com/b.zip", tmp_path / "b.zip")
+
+        mock_create_session.assert_called_once()
+        assert mock_session.get.call_count == 2
+
+    def test_download_file_returns_crc32(self, mock_session, tmp_path):
+        """Test that the CRC-32 is computed across all streamed chunks."""
+        mock_session.get.return_value = streaming_response([b"test ", b"content"])
+
+        dest_path = tmp_path / "test.zip"
+        crc = download_file(
+            "https://example.com/test.zip", dest_path, expected_crc32=zlib.crc32(b"test content")
+        )
+
+        assert crc == zlib.crc32(b"test content")
+        assert dest_path.read_bytes() == b"test content"
+
+    def test_download_file_crc32_mismatch(self, mock_session, tmp_path):
+        """Test that a corrupted download is rejected and removed."""
+        mock_session.get.return_value = streaming_response([b"corrupted"])
+
+        dest_path = tmp_path / "test.zip"
+        with pytest.raises(ValueError, match="CRC-32 mismatch"):
+            download_file(
+                "https://example.com/test.zip",
+                dest_path,
+                expected_crc32=zlib.crc32(b"test content"),
+            )
+
+        assert not dest_path.exists()
+
+    def test_download_file_custom_chunk_size(self, mock_session, tmp_path):
+        """Test that the chunk size can be overridden."""
+        mock_response = streaming_response([b"ab", b"cd"])
+        mock_session.get.return_value = mock_response
+
+        dest_path = tmp_path / "test.zip"
+        download_file("https://example.com/test.zip", dest_path, chunk_size=2)
+
+        assert dest_path.read_bytes() == b"abcd"
+        mock_response.iter_content.assert_called_once_with(chunk_size=2)
+
+    def test_download_file_preallocated_size_matches_content(self, mock_session, tmp_path):
+        """Test that preallocating from Content-Length doesn't leave trailing bytes."""
+        mock_response = streaming_response([b"abc", b"def"], headers={"Content-Length": "4096"})
+        mock_session.get.return_value = mock_response
+
+        dest_path = tmp_path / "test.zip"
+        download_file("https://example.com/test.zip", dest_path)
 
-    @patch("scripture_rag.downloader.create_session_with_retries")
-    def test_download_file_http_error(self, mock_create_session, tmp_path):
+        assert dest_path.read_bytes() == b"abcdef"
+        mock_response.iter_content.assert_called_once_with(chunk_size=DOWNLOAD_CHUNK_SIZE)
+
+    def test_download_file_without_fadvise(self, mock_session, tmp_path, monkeypatch):
+        """Test that downloads still work on platforms without posix_fadvise."""
+        monkeypatch.delattr("scripture_rag.downloader.os.posix_fadvise", raising=False)
+        mock_session.get.return_value = streaming_response([b"test content"])
+
+        dest_path = tmp_path / "test.zip"
+        download_file("https://example.com/test.zip", dest_path)
+
+        assert dest_path.read_bytes() == b"test content"
+
+    def test_download_file_http_error(self, mock_session, tmp_path):
         """Test download failure with HTTP error."""
-        # Create mock session that raises HTTPError
-        mock_session = MagicMock()
         mock_session.get.side_effect = requests.HTTPError("404 Not Found")
-        mock_create_session.return_value = mock_session
 
         dest_path = tmp_path / "test.zip"
         with pytest.raises(requests.HTTPError):
             download_file("https://example.com/test.zip", dest_path)
 
 
+class TestMaterialize:
+    """Tests for _materialize function."""
+
+    def test_materialize_falls_back_to_copy(self, tmp_path):
+        """Test that the file is copied when it can't be hardlinked."""
+        src = tmp_path / "src.txt"
+        src.write_text("contents")
+        dst = tmp_path / "dst.txt"
+
+        with patch("scripture_rag.downloader.os.link", side_effect=OSError("cross-device link")):
+            _materialize(src, dst)
+
+        assert dst.read_text() == "contents"
+        assert dst.stat().st_ino != src.stat().st_ino
+
+    def test_materialize_overwrites_existing_file(self, tmp_path):
+        """Test that an existing destination is replaced."""
+        src = tmp_path / "src.txt"
+        src.write_text("new")
+        dst = tmp_path / "dst.txt"
+        dst.write_text("old")
+
+        _materialize(src, dst)
+
+        assert dst.read_text() == "new"
+
+
 class TestExtractZip:
     """Tests for extract_zip function."""
 
@@ -80,6 +197,38 @@ class TestExtractZip:
         assert (result / "file.txt").exists()
         assert (result / "file.txt").read_text() == "test content"
 
+    def test_extract_zip_skips_named_files(self, tmp_path):
+        """Test that skipped file names are never extracted."""
+        zip_path = tmp_path / "test.zip"
+        extract_to = tmp_path / "extracted"
+        extract_to.mkdir()
+
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("test_dir/file.txt", "test content")
+            zf.writestr("test_dir/00.index1", "unwanted")
+            zf.writestr("test_dir/00.Readme", "unwanted")
+
+        result = extract_zip(zip_path, extract_to, skip=UNWANTED_FILES)
+
+        assert (result / "file.txt").exists()
+        assert not (result / "00.index1").exists()
+        assert not (result / "00.Readme").exists()
+
+    def test_extract_zip_deflated_restores_zlib(self, tmp_path):
+        """Test that deflated archives extract and zipfile's zlib is restored afterwards."""
+        zip_path = tmp_path / "test.zip"
+        extract_to = tmp_path / "extracted"
+        extract_to.mkdir()
+
+        content = "And it came to pass. " * 1000
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("test_dir/file.txt", content)
+
+        result = extract_zip(zip_path, extract_to)
+
+        assert (result / "file.txt").read_text() == content
+        assert zipfile.zlib is zlib
+
     def test_extract_zip_multiple_dirs_error(self, tmp_path):
         """Test error when zip contains multiple directories."""
         zip_path = tmp_path / "test.zip"
@@ -123,6 +272,27 @@ class TestAddTxtExtension:
         assert not (tmp_path / "file1").exists()
         assert not (tmp_path / "file2").exists()
 
+    def test_add_txt_extension_keeps_existing_dotted_names(self, tmp_path):
+        """Test that dotted and hidden names get .txt appended rather than replacing a suffix."""
+        (tmp_path / "01.Genesis").write_text("content")
+        (tmp_path / ".hidden").write_text("content")
+
+        add_txt_extension(tmp_path)
+
+        assert (tmp_path / "01.Genesis.txt").exists()
+        assert (tmp_path / ".hidden.txt").exists()
+
+    def test_add_txt_extension_skips_directories_and_symlinks(self, tmp_path):
+        """Test that only regular files are renamed."""
+        (tmp_path / "subdir").mkdir()
+        (tmp_path / "target.txt").write_text("content")
+        (tmp_path / "link").symlink_to(tmp_path / "target.txt")
+
+        add_txt_extension(tmp_path)
+
+        assert (tmp_path / "subdir").is_dir()
+        assert (tmp_path / "link").is_symlink()
+
     def test_add_txt_extension_empty_directory(self, tmp_path):
         """Test adding extensions in empty directory."""
         add_txt_extension(tmp_path)
@@ -198,6 +368,26 @@ class TestProcessScriptureDirectory:
 
         assert (target_dir / "new_file.txt").exists()
         assert not (target_dir / "old_file.txt").exists()
+        assert sorted(p.name for p in assets_dir.iterdir()) == ["test-scripture"]
+
+    def test_process_scripture_directory_is_atomic(self, tmp_path):
+        """Test that a failure while processing leaves the existing collection untouched."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "new_file").write_text("new content")
+
+        assets_dir = tmp_path / "assets"
+        assets_dir.mkdir()
+        target_dir = assets_dir / "test-scripture"
+        target_dir.mkdir()
+        (target_dir / "old_file.txt").write_text("old content")
+
+        with patch("scripture_rag.downloader.add_txt_extension", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                process_scripture_directory(source_dir, "test-scripture", assets_dir)
+
+        assert (target_dir / "old_file.txt").read_text() == "old content"
+        assert sorted(p.name for p in assets_dir.iterdir()) == ["test-scripture"]
 
 
 class TestEnsureAssetsDownloaded:
@@ -219,6 +409,22 @@ class TestEnsureAssetsDownloaded:
             assert result == assets_dir
             mock_download.assert_not_called()
 
+    def test_ensure_assets_downloaded_ignores_files_named_like_collections(self, tmp_path):
+        """Test that a plain file doesn't count as a downloaded collection."""
+        assets_dir = tmp_path / "assets"
+        assets_dir.mkdir()
+        for name in SCRIPTURE_URLS:
+            (assets_dir / name).mkdir()
+        shutil.rmtree(assets_dir / "bible")
+        (assets_dir / "bible").write_text("not a directory")
+
+        with patch("scripture_rag.downloader.download_file") as mock_download:
+            mock_download.side_effect = requests.RequestException("Network error")
+            with pytest.raises(requests.RequestException):
+                ensure_assets_downloaded(assets_dir)
+
+            assert mock_download.called
+
     def test_ensure_assets_downloaded_incomplete_assets(self, tmp_path):
         """Test re-download when assets directory is incomplete."""
         # Create incomplete assets structure (missing some directories)
@@ -236,12 +442,10 @@ class TestEnsureAssetsDownloaded:
                         (mock_dir / "00.Contents").write_text("contents")
                         (mock_dir / "file").write_text("content")
 
-                    mock_extract.side_effect = [
-                        tmp_path / "temp" / "bible" / "extracted",
-                        tmp_path / "temp" / "book-of-mormon" / "extracted",
-                        tmp_path / "temp" / "doctrine-and-covenants" / "extracted",
-                        tmp_path / "temp" / "pearl-of-great-price" / "extracted",
-                    ]
+                    # Downloads run concurrently, so key the result on the zip name
+                    mock_extract.side_effect = lambda zip_path, extract_to, skip=(): (
+                        tmp_path / "temp" / zip_path.stem / "extracted"
+                    )
 
                     result = ensure_assets_downloaded(assets_dir)
 
@@ -249,9 +453,7 @@ class TestEnsureAssetsDownloaded:
 
     @patch("scripture_rag.downloader.download_file")
     @patch("scripture_rag.downloader.extract_zip")
-    def test_ensure_assets_downloaded_full_download(
-        self, mock_extract, mock_download, tmp_path
-    ):
+    def test_ensure_assets_downloaded_full_download(self, mock_extract, mock_download, tmp_path):
         """Test complete download and processing flow."""
         assets_dir = tmp_path / "assets"
 
@@ -266,12 +468,10 @@ class TestEnsureAssetsDownloaded:
             (mock_dir / "file2").write_text("content2")
             mock_extracted_dirs[name] = mock_dir
 
-        # Configure mock to return appropriate extracted directories
-        mock_extract.side_effect = [
-            mock_extracted_dirs["bible"],
-            mock_extracted_dirs["book-of-mormon"],
-            mock_extracted_dirs["doctrine-and-covenants"],
-            mock_extracted_dirs["pearl-of-great-price"],
+        # Configure mock to return appropriate extracted directories. Downloads run
+        # concurrently, so key the result on the zip name rather than call order
+        mock_extract.side_effect = lambda zip_path, extract_to, skip=(): mock_extracted_dirs[
+            zip_path.stem
         ]
 
         result = ensure_assets_downloaded(assets_dir)
@@ -286,8 +486,11 @@ class TestEnsureAssetsDownloaded:
         assert (assets_dir / "doctrine-and-covenants").exists()
         assert (assets_dir / "pearl-of-great-price").exists()
 
-        # Verify Contents.txt was copied
+        # Verify Contents.txt was copied, as a hardlink since everything is on one filesystem
         assert (assets_dir / "Contents.txt").exists()
+        assert (assets_dir / "Contents.txt").stat().st_ino == (
+            assets_dir / "bible" / "00.Contents.txt"
+        ).stat().st_ino
 
         # Verify files were renamed with .txt extension
         assert (assets_dir / "bible" / "file1.txt").exists()
@@ -310,13 +513,41 @@ class TestEnsureAssetsDownloaded:
         # Verify assets directory was cleaned up
         assert not assets_dir.exists()
 
+    @patch("scripture_rag.downloader.process_scripture_directory")
+    @patch("scripture_rag.downloader.extract_zip")
+    @patch("scripture_rag.downloader.download_file")
+    def test_ensure_assets_downloaded_single_failure_aborts(
+        self, mock_download, mock_extract, mock_process, tmp_path
+    ):
+        """Test that one failed download aborts processing of every collection."""
+        assets_dir = tmp_path / "assets"
+
+        def download(url, dest_path, **kwargs):
+            if dest_path.stem == "book-of-mormon":
+                raise requests.RequestException("Network error")
+
+        mock_download.side_effect = download
+        mock_extract.side_effect = lambda zip_path, extract_to, skip=(): extract_to
+
+        with pytest.raises(requests.RequestException, match="Network error"):
+            ensure_assets_downloaded(assets_dir)
+
+        mock_process.assert_not_called()
+        assert not assets_dir.exists()
+
     def test_ensure_assets_downloaded_default_path(self):
         """Test that default assets path is used when none provided."""
         with patch("scripture_rag.downloader.download_file"):
             with patch("scripture_rag.downloader.extract_zip"):
-                with patch("scripture_rag.downloader.Path.exists") as mock_exists:
+                with patch("scripture_rag.downloader.os.scandir") as mock_scandir:
                     # Mock that all expected directories exist
-                    mock_exists.return_value = True
+                    entries = []
+                    for name in SCRIPTURE_URLS:
+                        entry = MagicMock()
+                        entry.name = name
+                        entry.is_dir.return_value = True
+                        entries.append(entry)
+                    mock_scandir.return_value.__enter__.return_value = entries
 
                     result = ensure_assets_downloaded()
 
@@ -1,10 +1,20 @@
 """Tests for scripture parsing functionality."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
-from scripture_rag.parser import ScriptureChunk, parse_all_scripture_files, parse_scripture_file
+from scripture_rag import parser
+from scripture_rag.parser import (
+    ScriptureChunk,
+    find_scripture_files,
+    iter_all_scripture_files,
+    parse_all_scripture_files,
+    parse_all_scripture_files_soa,
+    parse_scripture_file,
+    parse_scripture_file_columns,
+)
 
 
 class TestScriptureChunk:
@@ -32,6 +42,21 @@ class TestScriptureChunk:
         assert chunk.section_heading == "In the beginning"
         assert chunk.source_file == "/path/to/file.txt"
 
+    def test_scripture_chunk_has_no_instance_dict(self):
+        """Test that ScriptureChunk uses slots instead of a per-instance __dict__."""
+        chunk = ScriptureChunk(
+            text="Test verse text",
+            book="Genesis",
+            prefix="GEN",
+            chapter=1,
+            verse=1,
+            reference="Genesis 1:1",
+            section_heading="",
+            source_file="/path/to/file.txt",
+        )
+
+        assert not hasattr(chunk, "__dict__")
+
 
 class TestParseScriptureFile:
     """Tests for parse_scripture_file function."""
@@ -77,6 +102,51 @@ class TestParseScriptureFile:
         for chunk in jonah_chunks:
             assert chunk.section_heading == "Jonah Sent to Nineveh"
 
+    def test_parse_scripture_file_looks_up_book_once_per_prefix_run(
+        self, temp_scripture_file, sample_book_mapping
+    ):
+        """Test that the book mapping is only consulted when the prefix changes."""
+
+        class CountingMapping(dict):
+            lookups = 0
+
+            def get(self, key, default=None):
+                CountingMapping.lookups += 1
+                return super().get(key, default)
+
+        chunks = parse_scripture_file(temp_scripture_file, CountingMapping(sample_book_mapping))
+
+        prefix_runs = sum(
+            1 for i, chunk in enumerate(chunks) if i == 0 or chunk.prefix != chunks[i - 1].prefix
+        )
+        assert CountingMapping.lookups == prefix_runs < len(chunks)
+
+    def test_parse_scripture_file_shares_repeated_strings(
+        self, temp_scripture_file, sample_book_mapping
+    ):
+        """Test that verses from the same book share their repeated string fields."""
+        chunks = parse_scripture_file(temp_scripture_file, sample_book_mapping)
+        ruth_chunks = [c for c in chunks if c.prefix == "RTH"]
+        assert len(ruth_chunks) > 1
+
+        first, second = ruth_chunks[:2]
+        assert first.prefix is second.prefix
+        assert first.book is second.book
+        assert first.section_heading is second.section_heading
+        assert first.source_file is second.source_file
+
+    def test_parse_scripture_file_zero_padded_verse_zero_is_heading(self, tmp_path):
+        """Test that a zero-padded verse 0 is still treated as a section heading."""
+        content = """GEN 1:00 The Creation
+GEN 1:1 In the beginning God created the heaven and the earth.
+"""
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_text(content)
+
+        chunks = parse_scripture_file(scripture_file, {})
+        assert len(chunks) == 1
+        assert chunks[0].section_heading == "The Creation"
+
     def test_parse_scripture_file_correct_metadata(
         self, temp_scripture_file, sample_book_mapping
     ):
@@ -150,6 +220,33 @@ GEN 1:2 And the earth was without form, and void.
         assert chunks[0].verse == 1
         assert chunks[1].verse == 2
 
+    def test_parse_scripture_file_crlf_and_surrounding_whitespace(
+        self, tmp_path, sample_book_mapping
+    ):
+        """Test that CRLF line endings and indentation don't leak into the parsed fields."""
+        content = (
+            "  GEN 1:0 The Creation  \r\n"
+            "GEN 1:1 In the beginning\r\n"
+            "\r\n"
+            "\tGEN 1:2 And the earth\r\n"
+        )
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_bytes(content.encode("utf-8"))
+
+        chunks = parse_scripture_file(scripture_file, sample_book_mapping)
+        assert [chunk.text for chunk in chunks] == ["In the beginning", "And the earth"]
+        assert all(chunk.section_heading == "The Creation" for chunk in chunks)
+
+    def test_parse_scripture_file_bare_carriage_return_line_endings(
+        self, tmp_path, sample_book_mapping
+    ):
+        """Test that files using bare CR line endings are still split into lines."""
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_bytes(b"GEN 1:1 In the beginning\rGEN 1:2 And the earth\r")
+
+        chunks = parse_scripture_file(scripture_file, sample_book_mapping)
+        assert [chunk.text for chunk in chunks] == ["In the beginning", "And the earth"]
+
     def test_parse_scripture_file_unknown_abbreviation(self, tmp_path):
         """Test handling of unknown book abbreviations."""
         content = "UNK 1:1 This book abbreviation is not in the mapping."
@@ -172,6 +269,44 @@ GEN 1:2 And the earth was without form, and void.
         chunks = parse_scripture_file(scripture_file, sample_book_mapping)
         assert len(chunks) == 0
 
+    def test_parse_scripture_file_prefix_with_digits_and_ampersand(self, tmp_path):
+        """Test that abbreviations with digits and ampersands are parsed."""
+        content = """NE1 1:1 I, Nephi, having been born of goodly parents.
+D&C 1:1 Hearken, O ye people of my church.
+"""
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_text(content)
+
+        chunks = parse_scripture_file(scripture_file, {})
+        assert [chunk.prefix for chunk in chunks] == ["NE1", "D&C"]
+
+    def test_parse_scripture_file_text_with_colons_and_extra_whitespace(
+        self, tmp_path, sample_book_mapping
+    ):
+        """Test that verse text keeps colons and whitespace between fields is tolerated."""
+        content = "GEN   1:3\tAnd God said: Let there be light: and there was light.\n"
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_text(content)
+
+        chunks = parse_scripture_file(scripture_file, sample_book_mapping)
+        assert len(chunks) == 1
+        assert chunks[0].chapter == 1
+        assert chunks[0].verse == 3
+        assert chunks[0].text == "And God said: Let there be light: and there was light."
+
+    def test_parse_scripture_file_lowercase_prefix_ignored(self, tmp_path, sample_book_mapping):
+        """Test that lines whose prefix isn't an abbreviation are skipped."""
+        content = """gen 1:1 Not a valid abbreviation.
+GEN 1:x Not a valid verse number.
+GEN 1:2 And the earth was without form, and void.
+"""
+        scripture_file = tmp_path / "test.txt"
+        scripture_file.write_text(content)
+
+        chunks = parse_scripture_file(scripture_file, sample_book_mapping)
+        assert len(chunks) == 1
+        assert chunks[0].verse == 2
+
     def test_parse_scripture_file_multiple_chapters(self, tmp_path, sample_book_mapping):
         """Test parsing file with multiple chapters."""
         content = """GEN 1:1 First chapter, first verse.
@@ -192,6 +327,56 @@ GEN 2:2 Second chapter, second verse.
         assert chunks[3].chapter == 2
 
 
+class TestParseScriptureFileColumns:
+    """Tests for parse_scripture_file_columns function."""
+
+    def test_columns_match_chunks(self, temp_scripture_file, sample_book_mapping):
+        """Test that the column layout carries the same data as the chunk list."""
+        chunks = parse_scripture_file(temp_scripture_file, sample_book_mapping)
+        columns = parse_scripture_file_columns(temp_scripture_file, sample_book_mapping)
+
+        assert columns["ids"] == [f"{c.prefix}_{c.chapter}:{c.verse}" for c in chunks]
+        assert columns["documents"] == [c.text for c in chunks]
+        assert columns["metadatas"][0] == {
+            "book": "Ruth",
+            "prefix": "RTH",
+            "chapter": 1,
+            "verse": 1,
+            "reference": "Ruth 1:1",
+            "section_heading": "Ruth and Naomi",
+            "source_file": str(temp_scripture_file),
+        }
+
+    def test_columns_empty_file(self, tmp_path, sample_book_mapping):
+        """Test parsing an empty file into columns."""
+        scripture_file = tmp_path / "empty.txt"
+        scripture_file.write_text("")
+
+        columns = parse_scripture_file_columns(scripture_file, sample_book_mapping)
+        assert columns == {"ids": [], "documents": [], "metadatas": []}
+
+
+class TestFindScriptureFiles:
+    """Tests for find_scripture_files function."""
+
+    def test_find_scripture_files_one_level_deep(self, temp_assets_directory):
+        """Test that only .txt files inside subdirectories are found."""
+        (temp_assets_directory / "bible" / "readme.md").write_text("# README")
+        (temp_assets_directory / "bible" / "nested.txt").mkdir()
+
+        files = find_scripture_files(temp_assets_directory)
+
+        assert sorted(Path(f).name for f in files) == [
+            "01.1-nephi.txt",
+            "08.ruth.txt",
+            "32.jonah.txt",
+        ]
+
+    def test_find_scripture_files_empty_directory(self, tmp_path):
+        """Test that an empty assets directory yields no files."""
+        assert find_scripture_files(tmp_path) == []
+
+
 class TestParseAllScriptureFiles:
     """Tests for parse_all_scripture_files function."""
 
@@ -281,3 +466,303 @@ class TestParseAllScriptureFiles:
         # Source files should be actual file paths
         for chunk in chunks:
             assert Path(chunk.source_file).suffix == ".txt"
+
+    def test_parse_all_scripture_files_single_worker_matches_default(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that the result doesn't depend on the number of worker processes."""
+        parallel = parse_all_scripture_files(temp_assets_directory, sample_book_mapping)
+        serial = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, max_workers=1
+        )
+
+        assert parallel == serial
+
+    def test_parse_all_scripture_files_workers_env_var(
+        self, temp_assets_directory, sample_book_mapping, mocker, monkeypatch
+    ):
+        """Test that SCRIPTURE_RAG_WORKERS=1 parses in-process without a pool."""
+        monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", "1")
+        mock_pool = mocker.patch("scripture_rag.parser.ProcessPoolExecutor")
+
+        chunks = parse_all_scripture_files(temp_assets_directory, sample_book_mapping)
+
+        mock_pool.assert_not_called()
+        assert len(chunks) > 0
+
+    def test_parse_all_scripture_files_warning_on_error_in_process(
+        self, temp_assets_directory, sample_book_mapping, capsys
+    ):
+        """Test that in-process parsing reports failures the same way as the pool."""
+        (temp_assets_directory / "bible" / "bad.txt").write_bytes(b"\x80\x81\x82")
+
+        chunks = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, max_workers=1
+        )
+
+        assert len(chunks) > 0
+        assert "Warning: Failed to parse" in capsys.readouterr().out
+
+
+class TestParseWorkerCount:
+    """Tests for resolving the number of parse worker processes."""
+
+    def test_explicit_max_workers_wins(self, monkeypatch):
+        """Test that an explicit max_workers overrides the env var."""
+        monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", "3")
+        assert parser._parse_worker_count(2) == 2
+
+    def test_env_var_sets_worker_count(self, monkeypatch):
+        """Test that a positive SCRIPTURE_RAG_WORKERS is used as the worker count."""
+        monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", " 3 ")
+        assert parser._parse_worker_count(None) == 3
+
+    @pytest.mark.parametrize("value", [None, "", "0"])
+    def test_unset_env_var_uses_cpu_count(self, value, monkeypatch, mocker, capsys):
+        """Test that an unset, empty or zero env var falls back to the CPU count quietly."""
+        if value is None:
+            monkeypatch.delenv("SCRIPTURE_RAG_WORKERS", raising=False)
+        else:
+            monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", value)
+        mocker.patch("scripture_rag.parser.os.cpu_count", return_value=6)
+
+        assert parser._parse_worker_count(None) == 6
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("value", ["auto", "2.5", "-2"])
+    def test_invalid_env_var_warns_and_uses_cpu_count(self, value, monkeypatch, mocker, capsys):
+        """Test that a non-integer or negative env var is reported and ignored."""
+        monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", value)
+        mocker.patch("scripture_rag.parser.os.cpu_count", return_value=6)
+
+        assert parser._parse_worker_count(None) == 6
+        out = capsys.readouterr().out
+        assert "Warning: Ignoring invalid SCRIPTURE_RAG_WORKERS" in out
+        assert repr(value) in out
+
+    def test_invalid_env_var_does_not_break_parsing(
+        self, temp_assets_directory, sample_book_mapping, monkeypatch
+    ):
+        """Test that parsing still succeeds with an invalid env var."""
+        monkeypatch.setenv("SCRIPTURE_RAG_WORKERS", "auto")
+
+        chunks = parse_all_scripture_files(temp_assets_directory, sample_book_mapping)
+
+        assert len(chunks) > 0
+
+
+class TestIterAllScriptureFiles:
+    """Tests for iter_all_scripture_files function."""
+
+    def test_iter_all_matches_parse_all(self, temp_assets_directory, sample_book_mapping):
+        """Test that iterating yields the same chunks as parsing everything at once."""
+        chunks = parse_all_scripture_files(temp_assets_directory, sample_book_mapping)
+        iterated = list(iter_all_scripture_files(temp_assets_directory, sample_book_mapping))
+
+        assert iterated == chunks
+
+    def test_iter_all_scripture_files_is_lazy(
+        self, temp_assets_directory, sample_book_mapping, mocker
+    ):
+        """Test that files are only parsed as chunks are requested."""
+        spy = mocker.spy(parser, "parse_scripture_file")
+
+        chunks = iter_all_scripture_files(temp_assets_directory, sample_book_mapping, max_workers=1)
+        spy.assert_not_called()
+
+        next(chunks)
+        assert spy.call_count == 1
+
+    def test_iter_all_scripture_files_bounds_work_in_flight(
+        self, temp_assets_directory, sample_book_mapping, mocker
+    ):
+        """Test that the pool only parses a few files ahead and stops when closed early."""
+        bible_dir = temp_assets_directory / "bible"
+        for i in range(20):
+            (bible_dir / f"{40 + i}.extra.txt").write_text(f"JON 2:{i + 1} Extra verse {i}.\n")
+
+        submitted = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                submitted.append(args[-1])
+                return super().submit(fn, *args)
+
+        mocker.patch("scripture_rag.parser.ProcessPoolExecutor", CountingExecutor)
+
+        chunks = iter_all_scripture_files(temp_assets_directory, sample_book_mapping, max_workers=2)
+        next(chunks)
+        chunks.close()
+
+        # Two files per worker are submitted up front, plus one as the first is consumed
+        assert len(submitted) == 5
+
+    def test_iter_all_scripture_files_reports_failed_files(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that files failing to parse are collected when asked for."""
+        bad_file = temp_assets_directory / "bible" / "bad.txt"
+        bad_file.write_bytes(b"\x80\x81\x82")
+        failed_files = []
+
+        chunks = list(
+            iter_all_scripture_files(
+                temp_assets_directory, sample_book_mapping, max_workers=2, failed_files=failed_files
+            )
+        )
+
+        assert len(chunks) > 0
+        assert failed_files == [str(bad_file)]
+
+    def test_iter_all_empty_directory(self, tmp_path, sample_book_mapping):
+        """Test iterating over an empty assets directory."""
+        assert list(iter_all_scripture_files(tmp_path, sample_book_mapping)) == []
+
+
+class TestParseAllScriptureFilesCache:
+    """Tests for the parse cache of parse_all_scripture_files."""
+
+    def test_parse_all_uses_cache_on_second_call(
+        self, temp_assets_directory, sample_book_mapping, mocker
+    ):
+        """Test that a second call loads chunks from the cache instead of re-parsing."""
+        cache_path = temp_assets_directory / ".parsed-chunks.bin"
+        first = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+        assert cache_path.exists()
+
+        mock_map = mocker.patch("scripture_rag.parser._map_scripture_files")
+        second = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        mock_map.assert_not_called()
+        assert second == first
+        assert all(isinstance(chunk, ScriptureChunk) for chunk in second)
+
+    def test_parse_all_cache_invalidated_when_file_changes(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that modifying a scripture file invalidates the cache."""
+        cache_path = temp_assets_directory / ".parsed-chunks.bin"
+        parse_all_scripture_files(temp_assets_directory, sample_book_mapping, cache_path=cache_path)
+
+        (temp_assets_directory / "bible" / "32.jonah.txt").write_text(
+            "JON 1:1 A rewritten verse for the cache test.\n"
+        )
+        chunks = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        assert "A rewritten verse for the cache test." in [chunk.text for chunk in chunks]
+
+    def test_parse_all_does_not_cache_partial_result(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that a file failing to parse keeps the result out of the cache."""
+        cache_path = temp_assets_directory / ".parsed-chunks.bin"
+        (temp_assets_directory / "bible" / "bad.txt").write_bytes(b"\x80\x81\x82")
+
+        chunks = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        assert len(chunks) > 0
+        assert not cache_path.exists()
+
+    def test_chunk_list_ignores_column_cache(self, temp_assets_directory, sample_book_mapping):
+        """Test that a cache written in the column layout is a miss for the chunk list."""
+        cache_path = temp_assets_directory / ".parsed.bin"
+        columns = parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        chunks = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        assert all(isinstance(chunk, ScriptureChunk) for chunk in chunks)
+        assert [chunk.text for chunk in chunks] == columns["documents"]
+
+    def test_columns_ignore_chunk_list_cache(self, temp_assets_directory, sample_book_mapping):
+        """Test that a cache written in the chunk list layout is a miss for the columns."""
+        cache_path = temp_assets_directory / ".parsed.bin"
+        chunks = parse_all_scripture_files(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        columns = parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        assert set(columns) == {"ids", "documents", "metadatas"}
+        assert columns["documents"] == [chunk.text for chunk in chunks]
+
+
+class TestParseAllScriptureFilesSoa:
+    """Tests for parse_all_scripture_files_soa function."""
+
+    def test_soa_matches_chunk_list(self, temp_assets_directory, sample_book_mapping):
+        """Test that the column layout lines up with the chunk list."""
+        chunks = parse_all_scripture_files(temp_assets_directory, sample_book_mapping)
+        columns = parse_all_scripture_files_soa(temp_assets_directory, sample_book_mapping)
+
+        assert len(columns["ids"]) == len(columns["documents"]) == len(columns["metadatas"])
+        assert columns["documents"] == [c.text for c in chunks]
+        assert [m["reference"] for m in columns["metadatas"]] == [c.reference for c in chunks]
+
+    def test_soa_empty_directory(self, tmp_path, sample_book_mapping):
+        """Test parsing an empty assets directory into columns."""
+        columns = parse_all_scripture_files_soa(tmp_path, sample_book_mapping)
+        assert columns == {"ids": [], "documents": [], "metadatas": []}
+
+    def test_soa_cache_reused_when_files_unchanged(
+        self, temp_assets_directory, sample_book_mapping, mocker
+    ):
+        """Test that a second call loads from the cache instead of re-parsing."""
+        cache_path = temp_assets_directory / ".parsed-columns.bin"
+        first = parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+        assert cache_path.exists()
+
+        mock_map = mocker.patch("scripture_rag.parser._map_scripture_files")
+        second = parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        mock_map.assert_not_called()
+        assert second == first
+
+    def test_soa_cache_invalidated_when_file_changes(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that modifying a scripture file invalidates the cache."""
+        cache_path = temp_assets_directory / ".parsed-columns.bin"
+        parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        (temp_assets_directory / "bible" / "32.jonah.txt").write_text(
+            "JON 1:1 Now the word of the LORD came unto Jonah the son of Amittai, saying,\n"
+            "JON 1:2 Arise, go to Nineveh, that great city.\n"
+        )
+        columns = parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        assert "JON_1:2" in columns["ids"]
+
+    def test_soa_cache_invalidated_when_mapping_changes(
+        self, temp_assets_directory, sample_book_mapping
+    ):
+        """Test that a different book mapping invalidates the cache."""
+        cache_path = temp_assets_directory / ".parsed-columns.bin"
+        parse_all_scripture_files_soa(
+            temp_assets_directory, sample_book_mapping, cache_path=cache_path
+        )
+
+        columns = parse_all_scripture_files_soa(temp_assets_directory, {}, cache_path=cache_path)
+
+        assert {m["book"] for m in columns["metadatas"]} == {"RTH", "JON", "NE1"}
@@ -1,8 +1,16 @@
 """Tests for query engine functionality."""
 
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 
+from scripture_rag import query
 from scripture_rag.query import QueryResult, RAGResponse, ScriptureQueryEngine
+from scripture_rag.reranker import RerankResult
+
+pytestmark = pytest.mark.usefixtures("clear_shared_rerankers")
 
 
 class TestQueryResult:
@@ -44,6 +52,21 @@ class TestQueryResult:
 
         assert result.reranker_score is None
 
+    def test_query_result_is_frozen(self):
+        """Test that a QueryResult can't be modified after creation."""
+        result = QueryResult(
+            reference="Genesis 1:1",
+            text="Test text",
+            section_heading="",
+            book="Genesis",
+            chapter=1,
+            verse=1,
+            distance=0.5,
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.distance = 0.0
+
 
 class TestRAGResponse:
     """Tests for RAGResponse dataclass."""
@@ -79,6 +102,15 @@ class TestRAGResponse:
         assert response.results == []
         assert response.answer is None
 
+    def test_rag_response_compares_by_identity(self):
+        """Test that RAGResponses are hashable and compared by identity."""
+        response = RAGResponse(query="test query", results=[])
+        same_fields = RAGResponse(query="test query", results=[])
+
+        assert response == response
+        assert response != same_fields
+        assert len({response, same_fields}) == 2
+
 
 class TestScriptureQueryEngineInit:
     """Tests for ScriptureQueryEngine initialization."""
@@ -94,6 +126,15 @@ class TestScriptureQueryEngineInit:
         assert engine.reranker is not None
         assert engine.llm_available is False
 
+    def test_engines_share_reranker(self, tmp_path):
+        """Test that engines in the same process share one reranker."""
+        first = ScriptureQueryEngine(persist_directory=tmp_path / "first")
+        second = ScriptureQueryEngine(persist_directory=tmp_path / "second")
+        static = ScriptureQueryEngine(persist_directory=tmp_path / "static", static_reranker=True)
+
+        assert first.reranker is second.reranker
+        assert static.reranker is not first.reranker
+
     def test_initialization_with_api_key(self, mocker, tmp_path):
         """Test initialization with Gemini API key."""
         # Mock the genai module
@@ -159,6 +200,173 @@ class TestScriptureQueryEngineSearch:
         assert results[0].distance == 0.2
         assert results[1].reference == "Genesis 1:2"
 
+    def test_search_reuses_query_embedding(self, mocker, tmp_path):
+        """Test that repeating a query doesn't run the embedding model again."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_embed = mocker.patch.object(
+            engine.vector_store, "embed", return_value=np.array([[1.0, 0.0]])
+        )
+        mock_collection = mocker.Mock()
+        mock_collection.count.return_value = 1
+        mock_collection.query.return_value = {
+            "documents": [["Text 1"]],
+            "metadatas": [
+                [
+                    {
+                        "reference": "Genesis 1:1",
+                        "book": "Genesis",
+                        "chapter": 1,
+                        "verse": 1,
+                        "section_heading": "",
+                    }
+                ]
+            ],
+            "distances": [[0.2]],
+        }
+        mocker.patch.object(
+            engine.vector_store, "get_or_create_collection", return_value=mock_collection
+        )
+
+        # Different top_k values miss the result cache, so both searches hit the collection
+        engine.search("creation", top_k=5, use_reranker=False)
+        engine.search("creation", top_k=3, use_reranker=False)
+
+        mock_embed.assert_called_once_with(["creation"])
+        assert mock_collection.query.call_count == 2
+
+    def test_search_caches_results(self, mocker, tmp_path):
+        """Test that repeating a search returns cached results without querying again."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_query = mocker.patch.object(engine.vector_store, "query")
+        mock_query.return_value = {
+            "documents": ["Text 1"],
+            "metadatas": [
+                {
+                    "reference": "Alma 32:21",
+                    "book": "Alma",
+                    "chapter": 32,
+                    "verse": 21,
+                    "section_heading": "",
+                }
+            ],
+            "distances": [0.2],
+        }
+
+        first = engine.search("faith", top_k=1, books=["Alma"], use_reranker=False)
+        second = engine.search("faith", top_k=1, books=["Alma"], use_reranker=False)
+        engine.search("faith", top_k=1, books=["Moroni"], use_reranker=False)
+
+        assert second == first
+        assert second is not first
+        assert mock_query.call_count == 2
+
+    def test_search_cached_results_are_not_shared_mutably(self, mocker, tmp_path):
+        """Test that changing one search's results doesn't change a later cached search."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_query = mocker.patch.object(engine.vector_store, "query")
+        mock_query.return_value = {
+            "documents": ["Text 1"],
+            "metadatas": [
+                {
+                    "reference": "Alma 32:21",
+                    "book": "Alma",
+                    "chapter": 32,
+                    "verse": 21,
+                    "section_heading": "",
+                }
+            ],
+            "distances": [0.2],
+        }
+
+        first = engine.search("faith", top_k=1, use_reranker=False)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first[0].text = "Changed"
+        first.clear()
+
+        second = engine.search("faith", top_k=1, use_reranker=False)
+
+        assert mock_query.call_count == 1
+        assert [result.text for result in second] == ["Text 1"]
+
+    def test_search_reuses_saved_query_embedding(self, mocker, tmp_path):
+        """Test that a query embedded by one engine isn't embedded again by the next."""
+        for _ in range(2):
+            engine = ScriptureQueryEngine(persist_directory=tmp_path)
+            mock_embed = mocker.patch.object(
+                engine.vector_store, "embed", return_value=np.array([[1.0, 0.0]])
+            )
+            mock_collection = mocker.Mock()
+            mock_collection.count.return_value = 1
+            mock_collection.query.return_value = {
+                "documents": [[]],
+                "metadatas": [[]],
+                "distances": [[]],
+            }
+            mocker.patch.object(
+                engine.vector_store, "get_or_create_collection", return_value=mock_collection
+            )
+            engine.search("creation", top_k=5, use_reranker=False)
+
+        mock_embed.assert_not_called()
+        np.testing.assert_array_equal(
+            mock_collection.query.call_args.kwargs["query_embeddings"][0], [1.0, 0.0]
+        )
+
+    def test_search_empty_filter_skips_embedding(self, mocker, tmp_path):
+        """Test that a filter matching no verses returns nothing without embedding the query."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_embed = mocker.patch.object(engine.vector_store, "embed")
+        mock_collection = mocker.Mock()
+        mock_collection.get.return_value = {"ids": []}
+        mocker.patch.object(
+            engine.vector_store, "get_or_create_collection", return_value=mock_collection
+        )
+
+        results = engine.search("faith", books="Nonexistent", use_reranker=False)
+        engine.search("hope", books="Nonexistent", use_reranker=False)
+
+        assert results == []
+        mock_embed.assert_not_called()
+        mock_collection.query.assert_not_called()
+        mock_collection.get.assert_called_once_with(where={"book": "Nonexistent"}, include=[])
+
+    def test_search_small_filter_searches_exactly(self, mocker, tmp_path):
+        """Test that a filter matching few verses is searched in memory instead of via HNSW."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mocker.patch.object(engine.vector_store, "embed", return_value=np.array([[1.0, 0.0]]))
+        verses = {
+            "ids": ["RUTH_1:16", "RUTH_1:17"],
+            "documents": ["Whither thou goest", "Where thou diest"],
+            "metadatas": [
+                {
+                    "reference": f"Ruth 1:{verse}",
+                    "book": "Ruth",
+                    "chapter": 1,
+                    "verse": verse,
+                    "section_heading": "",
+                }
+                for verse in (16, 17)
+            ],
+            "embeddings": np.array([[0.0, 1.0], [0.6, 0.8]]),
+        }
+        mock_collection = mocker.Mock()
+        mock_collection.get.return_value = verses
+        mocker.patch.object(
+            engine.vector_store, "get_or_create_collection", return_value=mock_collection
+        )
+
+        results = engine.search("whither", top_k=2, books="Ruth", use_reranker=False)
+
+        mock_collection.query.assert_not_called()
+        assert [r.reference for r in results] == ["Ruth 1:17", "Ruth 1:16"]
+        assert results[0].distance == pytest.approx(0.8)
+        assert results[1].distance == pytest.approx(2.0)
+
     def test_search_with_single_book_filter(self, mocker, tmp_path):
         """Test search with single book filter."""
         engine = ScriptureQueryEngine(persist_directory=tmp_path)
@@ -201,6 +409,20 @@ class TestScriptureQueryEngineSearch:
         call_kwargs = mock_query.call_args[1]
         assert call_kwargs["where"] is None
 
+    def test_search_reuses_book_filter(self, mocker, tmp_path):
+        """Test that repeated searches with the same books share one where filter."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_query = mocker.patch.object(engine.vector_store, "query")
+        mock_query.return_value = {"documents": [], "metadatas": [], "distances": []}
+
+        engine.search("faith", top_k=5, books=["Alma", "Moroni"], use_reranker=False)
+        engine.search("hope", top_k=5, books=["Alma", "Moroni"], use_reranker=False)
+
+        first, second = (call[1]["where"] for call in mock_query.call_args_list)
+        assert first is second
+        assert first == {"book": {"$in": ["Alma", "Moroni"]}}
+
     def test_search_retrieval_factor_without_reranker(self, mocker, tmp_path):
         """Test that retrieval_factor is not used when reranker is disabled."""
         engine = ScriptureQueryEngine(persist_directory=tmp_path)
@@ -235,7 +457,9 @@ class TestScriptureQueryEngineSearch:
 
         # Mock the reranker
         mocker.patch.object(
-            engine.reranker, "rerank", return_value=[(i, 0.5) for i in range(5)]
+            engine.reranker,
+            "rerank",
+            return_value=RerankResult(indices=np.arange(5), scores=np.full(5, 0.5)),
         )
 
         engine.search("test", top_k=5, use_reranker=True, retrieval_factor=3.0)
@@ -253,16 +477,38 @@ class TestScriptureQueryEngineSearch:
         mock_results = {
             "documents": ["Text 1", "Text 2", "Text 3"],
             "metadatas": [
-                {"reference": "Gen 1:1", "book": "Genesis", "chapter": 1, "verse": 1, "section_heading": ""},
-                {"reference": "Gen 1:2", "book": "Genesis", "chapter": 1, "verse": 2, "section_heading": ""},
-                {"reference": "Gen 1:3", "book": "Genesis", "chapter": 1, "verse": 3, "section_heading": ""},
+                {
+                    "reference": "Gen 1:1",
+                    "book": "Genesis",
+                    "chapter": 1,
+                    "verse": 1,
+                    "section_heading": "",
+                },
+                {
+                    "reference": "Gen 1:2",
+                    "book": "Genesis",
+                    "chapter": 1,
+                    "verse": 2,
+                    "section_heading": "",
+                },
+                {
+                    "reference": "Gen 1:3",
+                    "book": "Genesis",
+                    "chapter": 1,
+                    "verse": 3,
+                    "section_heading": "",
+                },
             ],
             "distances": [0.5, 0.4, 0.6],
         }
         mocker.patch.object(engine.vector_store, "query", return_value=mock_results)
 
         # Mock reranker to reverse the order and return top 2
-        mocker.patch.object(engine.reranker, "rerank", return_value=[(2, 0.95), (0, 0.85)])
+        mocker.patch.object(
+            engine.reranker,
+            "rerank",
+            return_value=RerankResult(indices=np.array([2, 0]), scores=np.array([0.95, 0.85])),
+        )
 
         results = engine.search("test", top_k=2, use_reranker=True)
 
@@ -273,6 +519,116 @@ class TestScriptureQueryEngineSearch:
         assert results[1].reference == "Gen 1:1"
         assert results[1].reranker_score == 0.85
 
+    def test_search_builds_only_reranked_results(self, mocker, tmp_path):
+        """Test that QueryResults are only built for candidates that survive reranking."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_results = {
+            "documents": [f"Text {i}" for i in range(15)],
+            "metadatas": [
+                {
+                    "reference": f"Gen 1:{i + 1}",
+                    "book": "Genesis",
+                    "chapter": 1,
+                    "verse": i + 1,
+                    "section_heading": "",
+                }
+                for i in range(15)
+            ],
+            "distances": [0.1 * i for i in range(15)],
+        }
+        mocker.patch.object(engine.vector_store, "query", return_value=mock_results)
+        mocker.patch.object(
+            engine.reranker,
+            "rerank",
+            return_value=RerankResult(indices=np.array([7, 3]), scores=np.array([0.9, 0.8])),
+        )
+        mock_query_result = mocker.patch("scripture_rag.query.QueryResult", wraps=QueryResult)
+
+        results = engine.search("test", top_k=2, use_reranker=True)
+
+        assert mock_query_result.call_count == 2
+        assert [r.reference for r in results] == ["Gen 1:8", "Gen 1:4"]
+
+    def test_search_iter_builds_results_lazily(self, mocker, tmp_path):
+        """Test that search_iter only builds the QueryResults the caller consumes."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        mock_query = mocker.patch.object(engine.vector_store, "query")
+        mock_query.return_value = {
+            "documents": [f"Text {i}" for i in range(3)],
+            "metadatas": [
+                {
+                    "reference": f"Gen 1:{i + 1}",
+                    "book": "Genesis",
+                    "chapter": 1,
+                    "verse": i + 1,
+                    "section_heading": "",
+                }
+                for i in range(3)
+            ],
+            "distances": [0.1, 0.2, 0.3],
+        }
+        mock_query_result = mocker.patch("scripture_rag.query.QueryResult", wraps=QueryResult)
+
+        results = engine.search_iter("test", top_k=3, use_reranker=False)
+
+        mock_query.assert_called_once()
+        assert mock_query_result.call_count == 0
+        assert next(results).reference == "Gen 1:1"
+        assert mock_query_result.call_count == 1
+        assert [r.reference for r in results] == ["Gen 1:2", "Gen 1:3"]
+
+
+class TestScriptureQueryEngineBatchSearch:
+    """Tests for ScriptureQueryEngine.batch_search method."""
+
+    def test_batch_search_queries_vector_store_once(self, mocker, tmp_path):
+        """Test that all queries are retrieved in one batch and reranked separately."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+
+        def results_for(reference):
+            return {
+                "documents": [f"Text of {reference}"],
+                "metadatas": [
+                    {
+                        "reference": reference,
+                        "book": "Genesis",
+                        "chapter": 1,
+                        "verse": 1,
+                        "section_heading": "",
+                    }
+                ],
+                "distances": [0.3],
+            }
+
+        mock_batch_query = mocker.patch.object(
+            engine.vector_store,
+            "batch_query",
+            return_value=[results_for("Gen 1:1"), results_for("Gen 1:2")],
+        )
+        mock_rerank_many = mocker.patch.object(
+            engine.reranker,
+            "rerank_many",
+            return_value=[
+                RerankResult(indices=np.array([0]), scores=np.array([0.9])),
+                RerankResult(indices=np.array([0]), scores=np.array([0.8])),
+            ],
+        )
+
+        results = engine.batch_search(["faith", "hope"], top_k=1, books="Genesis")
+
+        mock_batch_query.assert_called_once_with(
+            ["faith", "hope"], n_results=3, where={"book": "Genesis"}, include_embeddings=False
+        )
+        mock_rerank_many.assert_called_once_with(
+            [("faith", ["Text of Gen 1:1"]), ("hope", ["Text of Gen 1:2"])], top_k=1
+        )
+        assert [[r.reference for r in query_results] for query_results in results] == [
+            ["Gen 1:1"],
+            ["Gen 1:2"],
+        ]
+
 
 class TestScriptureQueryEngineQuery:
     """Tests for ScriptureQueryEngine.query method."""
@@ -332,8 +688,83 @@ class TestScriptureQueryEngineQuery:
 
         mock_search = mocker.patch.object(engine, "search", return_value=[])
 
-        engine.query("test", top_k=10, books="Alma", use_llm=False, use_reranker=True, retrieval_factor=2.5)
+        engine.query(
+            "test", top_k=10, books="Alma", use_llm=False, use_reranker=True, retrieval_factor=2.5
+        )
 
         mock_search.assert_called_once_with(
-            "test", top_k=10, books="Alma", use_reranker=True, retrieval_factor=2.5
+            "test",
+            top_k=10,
+            books="Alma",
+            use_reranker=True,
+            retrieval_factor=2.5,
+            refine_top=None,
+        )
+
+
+class TestScriptureQueryEngineQueryWithLLM:
+    """Tests for ScriptureQueryEngine.query_with_llm method."""
+
+    @pytest.fixture
+    def mock_results(self):
+        return [
+            QueryResult(
+                reference="Genesis 1:1",
+                text="In the beginning God created the heaven and the earth.",
+                section_heading="",
+                book="Genesis",
+                chapter=1,
+                verse=1,
+                distance=0.5,
+            )
+        ]
+
+    def test_query_with_llm_generates_answer(self, mocker, tmp_path, mock_results):
+        """Test that the answer comes from the LLM and results reach the callback."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+        engine.llm_available = True
+        engine.model = mocker.Mock()
+        engine.model.generate_content.return_value = mocker.Mock(text="The answer.")
+        mocker.patch.object(engine, "search", return_value=mock_results)
+
+        seen = []
+        response = engine.query_with_llm("creation", on_results=seen.append)
+
+        assert response.answer == "The answer."
+        assert seen == [mock_results]
+        prompt = engine.model.generate_content.call_args[0][0]
+        assert "[Genesis 1:1] In the beginning" in prompt
+
+    def test_engines_share_llm_executor(self, mocker, tmp_path, mock_results):
+        """Test that LLM threads are started lazily and shared by every engine."""
+        query._llm_executor.cache_clear()
+        executor_class = mocker.patch(
+            "scripture_rag.query.ThreadPoolExecutor", wraps=ThreadPoolExecutor
         )
+        engines = [ScriptureQueryEngine(persist_directory=tmp_path / name) for name in "ab"]
+        assert not executor_class.called
+
+        for engine in engines:
+            engine.llm_available = True
+            engine.model = mocker.Mock()
+            engine.model.generate_content.return_value = mocker.Mock(text="The answer.")
+            mocker.patch.object(engine, "search", return_value=mock_results)
+            assert engine.query_with_llm("creation").answer == "The answer."
+
+        executor_class.assert_called_once()
+        query._llm_executor().shutdown()
+        query._llm_executor.cache_clear()
+
+    def test_query_with_llm_failure_returns_no_answer(self, mocker, tmp_path, mock_results, capsys):
+        """Test that an LLM error is reported and the results are still returned."""
+        engine = ScriptureQueryEngine(persist_directory=tmp_path)
+        engine.llm_available = True
+        engine.model = mocker.Mock()
+        engine.model.generate_content.side_effect = RuntimeError("quota exceeded")
+        mocker.patch.object(engine, "search", return_value=mock_results)
+
+        response = engine.query_with_llm("creation")
+
+        assert response.answer is None
+        assert response.results == mock_results
+        assert "Failed to generate LLM response" in capsys.readouterr().out
@@ -1,8 +1,19 @@
 """Tests for scripture reranker functionality."""
 
+import numpy as np
 import pytest
 
-from scripture_rag.reranker import ScriptureReranker
+from scripture_rag.reranker import (
+    MAX_TORCH_THREADS,
+    RerankResult,
+    ScriptureReranker,
+    StaticReranker,
+    _rank,
+    _Reranker,
+    configure_torch_threads,
+)
+
+pytestmark = pytest.mark.usefixtures("clear_shared_rerankers")
 
 
 class TestScriptureReranker:
@@ -13,9 +24,40 @@ class TestScriptureReranker:
         reranker = ScriptureReranker()
 
         assert reranker.model_name == "cross-encoder/ms-marco-MiniLM-L-6-v2"
+        assert reranker.batch_size == 64
         # Model should not be loaded yet (lazy loading)
         assert reranker._model is None
 
+    def test_reranker_eager_load(self, mocker, monkeypatch):
+        """Test that the model is loaded on construction when preloading is requested."""
+        monkeypatch.setenv("SCRIPTURE_RAG_PRELOAD_RERANKER", "1")
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+
+        reranker = ScriptureReranker()
+
+        assert reranker._model is not None
+        mock_cross_encoder.assert_called_once_with("cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+    def test_reranker_singleton(self):
+        """Test that get() shares one reranker per class and model."""
+        reranker = ScriptureReranker.get()
+
+        assert ScriptureReranker.get() is reranker
+        assert reranker.model_name == "cross-encoder/ms-marco-MiniLM-L-6-v2"
+        assert ScriptureReranker.get("cross-encoder/ms-marco-TinyBERT-L-2-v2") is not reranker
+        assert isinstance(StaticReranker.get(), StaticReranker)
+
+    def test_reranker_singleton_ignores_argument_spelling(self, mocker):
+        """Test that the default model is shared however its name is passed."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        reranker = ScriptureReranker.get()
+
+        assert ScriptureReranker.get(ScriptureReranker.DEFAULT_MODEL_NAME) is reranker
+        assert ScriptureReranker.get(model_name=ScriptureReranker.DEFAULT_MODEL_NAME) is reranker
+
+        reranker.model
+        mock_cross_encoder.assert_called_once_with(ScriptureReranker.DEFAULT_MODEL_NAME)
+
     def test_reranker_initialization_custom_model(self):
         """Test reranker initialization with custom model."""
         custom_model = "cross-encoder/ms-marco-TinyBERT-L-2-v2"
@@ -24,6 +66,33 @@ class TestScriptureReranker:
         assert reranker.model_name == custom_model
         assert reranker._model is None
 
+    def test_reranker_leaves_torch_threads_alone(self, mocker):
+        """Test that creating a reranker doesn't change process-wide torch settings."""
+        mock_torch = mocker.patch("scripture_rag.reranker.torch")
+
+        ScriptureReranker()
+
+        mock_torch.set_num_threads.assert_not_called()
+        mock_torch.set_num_interop_threads.assert_not_called()
+
+    def test_configure_torch_threads(self, mocker):
+        """Test that torch's thread pools are sized on request."""
+        mock_torch = mocker.patch("scripture_rag.reranker.torch")
+
+        configure_torch_threads(4)
+
+        mock_torch.set_num_threads.assert_called_once_with(4)
+        mock_torch.set_num_interop_threads.assert_called_once_with(1)
+
+    def test_configure_torch_threads_default_is_capped(self, mocker):
+        """Test that the default thread count is the CPU count, capped."""
+        mocker.patch("scripture_rag.reranker.os.cpu_count", return_value=64)
+        mock_torch = mocker.patch("scripture_rag.reranker.torch")
+
+        configure_torch_threads()
+
+        mock_torch.set_num_threads.assert_called_once_with(MAX_TORCH_THREADS)
+
     def test_reranker_lazy_loading(self, mocker):
         """Test that model is lazy loaded on first access."""
         # Mock the CrossEncoder class
@@ -41,6 +110,112 @@ class TestScriptureReranker:
         assert model is mock_model_instance
         mock_cross_encoder.assert_called_once_with("cross-encoder/ms-marco-MiniLM-L-6-v2")
 
+    def test_reranker_quantizes_model_on_load(self, mocker):
+        """Test that the loaded cross-encoder is quantized by default."""
+        import torch
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_model_instance.model = torch.nn.Linear(4, 4)
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_quantize = mocker.patch("scripture_rag.reranker.quantize_dynamic_int8")
+
+        reranker = ScriptureReranker()
+        _ = reranker.model
+
+        mock_quantize.assert_called_once_with(mock_model_instance.model)
+
+    def test_reranker_quantization_disabled(self, mocker):
+        """Test that quantization can be turned off."""
+        import torch
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_model_instance.model = torch.nn.Linear(4, 4)
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_quantize = mocker.patch("scripture_rag.reranker.quantize_dynamic_int8")
+
+        reranker = ScriptureReranker(quantize=False)
+        _ = reranker.model
+
+        mock_quantize.assert_not_called()
+
+    def test_reranker_keeps_fp32_on_cpu(self, mocker):
+        """Test that a CPU model isn't cast to reduced precision."""
+        import torch
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_model_instance.model = torch.nn.Linear(4, 4)
+        mock_cross_encoder.return_value = mock_model_instance
+        mocker.patch("scripture_rag.reranker.quantize_dynamic_int8")
+
+        reranker = ScriptureReranker(precision="fp16")
+        _ = reranker.model
+
+        assert mock_model_instance.model.weight.dtype == torch.float32
+
+    def test_reranker_invalid_precision(self):
+        """Test that an unknown precision is rejected."""
+        with pytest.raises(ValueError):
+            ScriptureReranker(precision="fp8")
+
+    def test_reranker_onnx_backend_loads_cached_export(self, mocker, tmp_path):
+        """Test that the ONNX backend loads a previously exported quantized model."""
+        mocker.patch("scripture_rag.reranker.ONNX_CACHE_DIR", tmp_path)
+        export_dir = tmp_path / "cross-encoder__ms-marco-MiniLM-L-6-v2"
+        quantized_file = export_dir / "onnx" / "model_qint8_avx512_vnni.onnx"
+        quantized_file.parent.mkdir(parents=True)
+        quantized_file.write_bytes(b"")
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_export = mocker.patch(
+            "sentence_transformers.export_dynamic_quantized_onnx_model", create=True
+        )
+
+        reranker = ScriptureReranker(backend="onnx")
+        model = reranker.model
+
+        assert model is mock_cross_encoder.return_value
+        mock_export.assert_not_called()
+        mock_cross_encoder.assert_called_once_with(
+            str(export_dir),
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_qint8_avx512_vnni.onnx"},
+        )
+
+    def test_reranker_onnx_backend_falls_back_to_torch(self, mocker, tmp_path):
+        """Test that a missing ONNX runtime falls back to the torch backend."""
+        mocker.patch("scripture_rag.reranker.ONNX_CACHE_DIR", tmp_path)
+        torch_model = mocker.Mock()
+
+        def fake_cross_encoder(model_name, **kwargs):
+            if kwargs.get("backend") == "onnx":
+                raise ImportError("optimum is not installed")
+            return torch_model
+
+        mocker.patch("scripture_rag.reranker.CrossEncoder", side_effect=fake_cross_encoder)
+
+        reranker = ScriptureReranker(backend="onnx")
+
+        assert reranker.model is torch_model
+
+    def test_reranker_onnx_backend_without_exporter(self, mocker, monkeypatch, tmp_path):
+        """Test that sentence-transformers without the ONNX exporter falls back to torch."""
+        mocker.patch("scripture_rag.reranker.ONNX_CACHE_DIR", tmp_path)
+        monkeypatch.delattr(
+            "sentence_transformers.export_dynamic_quantized_onnx_model", raising=False
+        )
+        torch_model = mocker.Mock()
+        mock_cross_encoder = mocker.patch(
+            "scripture_rag.reranker.CrossEncoder", return_value=torch_model
+        )
+
+        reranker = ScriptureReranker(backend="onnx")
+
+        assert reranker.model is torch_model
+        mock_cross_encoder.assert_called_once_with("cross-encoder/ms-marco-MiniLM-L-6-v2")
+
     def test_rerank_basic(self, mocker):
         """Test basic reranking functionality."""
         # Mock the CrossEncoder
@@ -60,7 +235,7 @@ class TestScriptureReranker:
             "Faith without works",
         ]
 
-        results = reranker.rerank(query, documents)
+        results = reranker.rerank(query, documents).as_tuples()
 
         # Should return list of (index, score) tuples
         assert len(results) == 4
@@ -75,12 +250,14 @@ class TestScriptureReranker:
 
         # Verify the correct pairs were passed to the model
         expected_pairs = [
-            [query, "Have faith in God"],
-            [query, "The weather is nice"],
-            [query, "Prayer brings peace"],
-            [query, "Faith without works"],
+            (query, "Have faith in God"),
+            (query, "The weather is nice"),
+            (query, "Prayer brings peace"),
+            (query, "Faith without works"),
         ]
-        mock_model_instance.predict.assert_called_once_with(expected_pairs)
+        mock_model_instance.predict.assert_called_once_with(
+            expected_pairs, batch_size=4, convert_to_numpy=True, show_progress_bar=False
+        )
 
     def test_rerank_with_top_k(self, mocker):
         """Test reranking with top_k limit."""
@@ -94,7 +271,7 @@ class TestScriptureReranker:
         reranker = ScriptureReranker()
         documents = ["doc1", "doc2", "doc3", "doc4", "doc5"]
 
-        results = reranker.rerank("query", documents, top_k=3)
+        results = reranker.rerank("query", documents, top_k=3).as_tuples()
 
         # Should only return top 3 results
         assert len(results) == 3
@@ -103,10 +280,62 @@ class TestScriptureReranker:
         assert results[1] == (0, 0.8)
         assert results[2] == (4, 0.7)
 
+    def test_rerank_buckets_by_length_across_batches(self, mocker):
+        """Test that pairs are scored shortest-first when they span several batches."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_cross_encoder.return_value = mock_model_instance
+
+        # Score each document by its own length so the mapping back can be checked
+        mock_model_instance.predict.side_effect = lambda pairs, **kwargs: [
+            float(len(doc)) for _, doc in pairs
+        ]
+
+        reranker = ScriptureReranker(batch_size=2)
+        documents = ["medium doc", "a much longer document", "short"]
+        results = reranker.rerank("query", documents).as_tuples()
+
+        scored_pairs = mock_model_instance.predict.call_args[0][0]
+        assert [doc for _, doc in scored_pairs] == ["short", "medium doc", "a much longer document"]
+        assert results == [(1, 22.0), (0, 10.0), (2, 5.0)]
+
+    def test_rerank_reuses_cached_scores(self, mocker):
+        """Test that previously scored pairs are served from the score cache."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_model_instance.predict.side_effect = lambda pairs, **kwargs: [
+            float(len(doc)) for _, doc in pairs
+        ]
+
+        reranker = ScriptureReranker()
+        first = reranker.rerank("query", ["short", "medium doc"]).as_tuples()
+        second = reranker.rerank("query", ["medium doc", "short", "longest document"])
+        second = second.as_tuples()
+
+        # Only the unseen document is scored on the second call
+        assert mock_model_instance.predict.call_count == 2
+        assert mock_model_instance.predict.call_args[0][0] == [("query", "longest document")]
+        assert first == [(1, 10.0), (0, 5.0)]
+        assert second == [(2, 16.0), (0, 10.0), (1, 5.0)]
+
+    def test_rerank_score_cache_disabled(self, mocker):
+        """Test that a zero cache size scores every call afresh."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_model_instance.predict.return_value = [0.5]
+
+        reranker = ScriptureReranker(cache_size=0)
+        reranker.rerank("query", ["doc"])
+        reranker.rerank("query", ["doc"])
+
+        assert mock_model_instance.predict.call_count == 2
+
     def test_rerank_empty_documents(self, mocker):
         """Test reranking with empty document list."""
         reranker = ScriptureReranker()
-        results = reranker.rerank("query", [])
+        results = reranker.rerank("query", []).as_tuples()
 
         assert results == []
 
@@ -118,7 +347,7 @@ class TestScriptureReranker:
         mock_model_instance.predict.return_value = [0.75]
 
         reranker = ScriptureReranker()
-        results = reranker.rerank("query", ["single doc"])
+        results = reranker.rerank("query", ["single doc"]).as_tuples()
 
         assert len(results) == 1
         assert results[0] == (0, 0.75)
@@ -131,7 +360,7 @@ class TestScriptureReranker:
         mock_model_instance.predict.return_value = [0.5, 0.8, 0.3]
 
         reranker = ScriptureReranker()
-        results = reranker.rerank("query", ["doc1", "doc2", "doc3"], top_k=None)
+        results = reranker.rerank("query", ["doc1", "doc2", "doc3"], top_k=None).as_tuples()
 
         # Should return all documents
         assert len(results) == 3
@@ -144,7 +373,7 @@ class TestScriptureReranker:
         mock_model_instance.predict.return_value = [0.5, 0.8]
 
         reranker = ScriptureReranker()
-        results = reranker.rerank("query", ["doc1", "doc2"], top_k=10)
+        results = reranker.rerank("query", ["doc1", "doc2"], top_k=10).as_tuples()
 
         # Should return all available documents
         assert len(results) == 2
@@ -160,7 +389,7 @@ class TestScriptureReranker:
 
         reranker = ScriptureReranker()
         documents = ["first", "second", "third"]
-        results = reranker.rerank("query", documents)
+        results = reranker.rerank("query", documents).as_tuples()
 
         # Results should reference original indices
         assert results[0][0] == 2  # "third" had highest score
@@ -171,6 +400,43 @@ class TestScriptureReranker:
         for idx, score in results:
             assert documents[idx] is not None
 
+    def test_rerank_returns_arrays(self, mocker):
+        """Test that indices and scores are returned as parallel numpy arrays."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_model_instance.predict.return_value = np.array([0.2, 0.9, 0.5])
+
+        reranker = ScriptureReranker()
+        results = reranker.rerank("query", ["doc1", "doc2", "doc3"], top_k=2)
+
+        assert isinstance(results, RerankResult)
+        assert len(results) == 2
+        np.testing.assert_array_equal(results.indices, [1, 2])
+        np.testing.assert_array_equal(results.scores, [0.9, 0.5])
+
+    def test_rerank_two_stage_only_cross_encodes_refined_documents(self, mocker):
+        """Test that only the refine_top closest documents reach the cross-encoder."""
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_model_instance = mocker.Mock()
+        mock_cross_encoder.return_value = mock_model_instance
+        mock_model_instance.predict.return_value = np.array([0.3, 0.7])
+
+        document_embeddings = np.array([[0.0, 1.0], [1.0, 0.0], [0.6, 0.8], [0.8, 0.6]])
+
+        reranker = ScriptureReranker()
+        results = reranker.rerank_two_stage(
+            "query",
+            np.array([1.0, 0.0]),
+            document_embeddings,
+            ["far", "near", "middle", "close"],
+            refine_top=2,
+        )
+
+        pairs = mock_model_instance.predict.call_args[0][0]
+        assert pairs == [("query", "near"), ("query", "close")]
+        assert results.as_tuples() == [(3, 0.7), (1, 0.3)]
+
     def test_rerank_scores_are_floats(self, mocker):
         """Test that scores are converted to Python floats."""
         mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
@@ -183,9 +449,183 @@ class TestScriptureReranker:
         mock_model_instance.predict.return_value = np.array([0.5, 0.8])
 
         reranker = ScriptureReranker()
-        results = reranker.rerank("query", ["doc1", "doc2"])
+        results = reranker.rerank("query", ["doc1", "doc2"]).as_tuples()
 
         # Scores should be Python floats
         for idx, score in results:
             assert isinstance(score, float)
             assert not isinstance(score, np.floating)
+
+    def test_rerank_float32_scores_are_native(self, mocker):
+        """Test that float32 model scores come back, and are cached, as Python numbers."""
+        import numpy as np
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_cross_encoder.return_value.predict.return_value = np.array(
+            [0.5, 0.8], dtype=np.float32
+        )
+
+        reranker = ScriptureReranker()
+        results = reranker.rerank("query", ["doc1", "doc2"]).as_tuples()
+
+        assert [type(idx) for idx, _ in results] == [int, int]
+        assert [type(score) for _, score in results] == [float, float]
+        assert all(type(score) is float for _, score in reranker.score_cache._entries.values())
+
+    def test_rerank_many_scores_in_one_call(self, mocker):
+        """Test that every request's pairs are scored in one predict call and split back."""
+        import numpy as np
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_predict = mock_cross_encoder.return_value.predict
+        mock_predict.side_effect = lambda pairs, **kwargs: np.array(
+            [float(len(doc)) for _, doc in pairs]
+        )
+
+        reranker = ScriptureReranker(cache_size=0)
+        results = reranker.rerank_many(
+            [("q1", ["a", "ccc", "bb"]), ("q2", ["dddd", "e"]), ("q3", [])], top_k=2
+        )
+
+        assert [result.as_tuples() for result in results] == [
+            [(1, 3.0), (2, 2.0)],
+            [(0, 4.0), (1, 1.0)],
+            [],
+        ]
+        mock_predict.assert_called_once()
+        assert mock_predict.call_args[0][0] == [
+            ("q1", "a"),
+            ("q1", "ccc"),
+            ("q1", "bb"),
+            ("q2", "dddd"),
+            ("q2", "e"),
+        ]
+
+    def test_rerank_serializes_concurrent_calls(self, mocker):
+        """Test that reranking from several threads never runs the model concurrently."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        import numpy as np
+
+        active = 0
+        max_active = 0
+        counter_lock = threading.Lock()
+
+        def predict(pairs, **kwargs):
+            nonlocal active, max_active
+            with counter_lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.01)
+            with counter_lock:
+                active -= 1
+            return np.ones(len(pairs))
+
+        mock_cross_encoder = mocker.patch("scripture_rag.reranker.CrossEncoder")
+        mock_cross_encoder.return_value.predict.side_effect = predict
+
+        reranker = ScriptureReranker(cache_size=0)
+        _ = reranker.model
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(reranker.rerank, f"query {i}", ["doc"]) for i in range(16)]
+            for future in futures:
+                future.result()
+
+        assert mock_cross_encoder.return_value.predict.call_count == 16
+        assert max_active == 1
+
+
+class TestRerankerBase:
+    """Tests for the _Reranker base class."""
+
+    def test_rerank_is_abstract(self):
+        """Test that a reranker without rerank() can't be instantiated."""
+
+        class Incomplete(_Reranker):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestRank:
+    """Tests for the _rank top-k helper."""
+
+    def test_rank_partial_top_k_matches_full_sort(self):
+        """Test that selecting the top k gives the same order as sorting everything."""
+        scores = np.random.default_rng(0).random(100)
+
+        full = _rank(scores, None)
+        partial = _rank(scores, 10)
+
+        np.testing.assert_array_equal(partial.indices, full.indices[:10])
+        np.testing.assert_array_equal(partial.scores, full.scores[:10])
+
+    def test_rank_ties_keep_document_order(self):
+        """Test that equal scores stay in their original order when truncated."""
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1])
+
+        assert _rank(scores, 3).indices.tolist() == [1, 0, 2]
+
+    def test_rank_zero_top_k(self):
+        """Test that top_k=0 returns nothing."""
+        assert len(_rank(np.array([0.3, 0.7]), 0)) == 0
+
+
+class TestStaticReranker:
+    """Tests for StaticReranker class."""
+
+    def test_static_reranker_lazy_loading(self, mocker):
+        """Test that the static model is only loaded on first use."""
+        mock_sentence_transformer = mocker.patch("scripture_rag.reranker.SentenceTransformer")
+
+        reranker = StaticReranker()
+        assert reranker._model is None
+        mock_sentence_transformer.assert_not_called()
+
+        reranker.model
+        mock_sentence_transformer.assert_called_once_with(
+            "sentence-transformers/static-retrieval-mrl-en-v1", device="cpu"
+        )
+
+    def test_static_rerank_orders_by_similarity(self, mocker):
+        """Test that documents are ranked by dot product with the query embedding."""
+        mock_sentence_transformer = mocker.patch("scripture_rag.reranker.SentenceTransformer")
+        mock_model_instance = mocker.Mock()
+        mock_sentence_transformer.return_value = mock_model_instance
+
+        embeddings = {
+            "query": [1.0, 0.0],
+            "far": [0.0, 1.0],
+            "near": [1.0, 0.0],
+            "middle": [0.6, 0.8],
+        }
+        mock_model_instance.encode.side_effect = lambda texts, **kwargs: np.array(
+            [embeddings[text] for text in texts]
+        )
+
+        reranker = StaticReranker()
+        results = reranker.rerank("query", ["far", "near", "middle"], top_k=2).as_tuples()
+
+        assert results == [(1, 1.0), (2, 0.6)]
+
+    def test_static_rerank_reuses_document_embeddings(self, mocker):
+        """Test that each document is only embedded once."""
+        mock_sentence_transformer = mocker.patch("scripture_rag.reranker.SentenceTransformer")
+        mock_model_instance = mocker.Mock()
+        mock_sentence_transformer.return_value = mock_model_instance
+        mock_model_instance.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 2))
+
+        reranker = StaticReranker()
+        reranker.rerank("first query", ["doc1", "doc2"])
+        reranker.rerank("second query", ["doc2", "doc3"])
+
+        encoded = [call.args[0] for call in mock_model_instance.encode.call_args_list]
+        assert encoded == [["first query"], ["doc1", "doc2"], ["second query"], ["doc3"]]
+
+    def test_static_rerank_empty_documents(self):
+        """Test reranking with empty document list."""
+        reranker = StaticReranker()
+        assert reranker.rerank("query", []).as_tuples() == []
@@ -0,0 +1,458 @@
+"""Tests for vector store functionality."""
+
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+from scripture_rag import vector_store
+from scripture_rag.vector_store import (
+    EMBEDDING_MODEL_NAME,
+    FaissScriptureVectorStore,
+    ScriptureVectorStore,
+)
+
+
+def _fake_encode(texts, **kwargs):
+    """Embed each text as a unit vector that depends only on its length."""
+    embeddings = np.array([[len(text), 1.0, 0.0, 0.0] for text in texts], dtype=np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def _random_encode(texts, **kwargs):
+    """Embed each text as a random unit vector seeded by the text."""
+    embeddings = np.array(
+        [np.random.default_rng(zlib.crc32(text.encode())).standard_normal(8) for text in texts],
+        dtype=np.float32,
+    )
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def mock_encoder(mocker):
+    """Replace the sentence-transformers model with a cheap deterministic encoder."""
+    encoder = mocker.Mock()
+    encoder.device.type = "cpu"
+    encoder.get_sentence_embedding_dimension.return_value = 4
+    encoder.encode.side_effect = _fake_encode
+    mocker.patch("scripture_rag.vector_store.SentenceTransformer", return_value=encoder)
+    vector_store._load_encoder.cache_clear()
+    yield encoder
+    vector_store._load_encoder.cache_clear()
+
+
+@pytest.fixture
+def store(tmp_path, mock_encoder):
+    """A Chroma vector store using the mock encoder."""
+    return ScriptureVectorStore(persist_directory=tmp_path / "chroma")
+
+
+class TestEmbed:
+    """Tests for embedding through the store's encoder."""
+
+    def test_embed_uses_public_encoder(self, store, mock_encoder):
+        """Test that embed encodes through the store's encoder attribute."""
+        embeddings = store.embed(["a", "bb"], batch_size=8)
+
+        assert store.encoder is mock_encoder
+        assert embeddings.shape == (2, 4)
+        mock_encoder.encode.assert_called_once_with(
+            ["a", "bb"],
+            batch_size=8,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+    def test_chroma_embedding_function_shares_encoder(self, store, mock_encoder):
+        """Test that Chroma's embedding function embeds with the same model instance."""
+        embeddings = store.embedding_function(["abc"])
+
+        assert store.embedding_function.encoder is mock_encoder
+        assert len(embeddings) == 1
+        assert store.embedding_function.get_config()["model_name"] == EMBEDDING_MODEL_NAME
+
+    def test_stores_share_encoder(self, tmp_path, mock_encoder):
+        """Test that stores in one process load the embedding model only once."""
+        first = ScriptureVectorStore(persist_directory=tmp_path / "first")
+        second = FaissScriptureVectorStore(persist_directory=tmp_path / "second")
+
+        assert first.encoder is second.encoder
+        vector_store.SentenceTransformer.assert_called_once_with(EMBEDDING_MODEL_NAME, device="cpu")
+
+    def test_quantized_store_loads_own_encoder(self, tmp_path, mock_encoder, mocker):
+        """Test that quantizing in place doesn't affect stores using the full-precision model."""
+        mock_quantize = mocker.patch("scripture_rag.vector_store.quantize_dynamic_int8")
+
+        ScriptureVectorStore(persist_directory=tmp_path / "first")
+        ScriptureVectorStore(persist_directory=tmp_path / "second", quantize=True)
+        ScriptureVectorStore(persist_directory=tmp_path / "third", quantize=True)
+
+        assert vector_store.SentenceTransformer.call_count == 2
+        mock_quantize.assert_called_once()
+
+    def test_opening_collection_loads_no_other_model(self, store):
+        """Test that Chroma doesn't build its own copy of the model for the collection."""
+        store.get_or_create_collection()
+        store.clear_collection()
+
+        vector_store.SentenceTransformer.assert_called_once()
+
+
+class TestDocumentEmbeddingCache:
+    """Tests for the float16 document embedding cache."""
+
+    def test_cache_hit_skips_encoding(self, store, mock_encoder, tmp_path):
+        """Test that a second run loads saved embeddings instead of encoding."""
+        documents = ["a", "bb", "ccc"]
+        cache_dir = tmp_path / "embeddings"
+
+        first = store.embed_documents(documents, batch_size=2, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("*.f16.npy"))) == 1
+
+        mock_encoder.encode.reset_mock()
+        second = store.embed_documents(documents, batch_size=2, cache_dir=cache_dir)
+
+        mock_encoder.encode.assert_not_called()
+        assert second.dtype == np.float16
+        np.testing.assert_allclose(second, first, atol=1e-3)
+
+    def test_cache_yields_batches(self, store, tmp_path):
+        """Test that cached embeddings are yielded in the requested batch sizes."""
+        documents = ["a", "bb", "ccc", "dddd", "eeeee"]
+        cache_dir = tmp_path / "embeddings"
+        store.embed_documents(documents, cache_dir=cache_dir)
+
+        batches = list(store.iter_document_embeddings(documents, 2, cache_dir=cache_dir))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    def test_changed_documents_miss_cache(self, store, mock_encoder, tmp_path):
+        """Test that saved embeddings aren't reused for a different corpus."""
+        cache_dir = tmp_path / "embeddings"
+        store.embed_documents(["a", "bb"], cache_dir=cache_dir)
+
+        mock_encoder.encode.reset_mock()
+        store.embed_documents(["a", "bbb"], cache_dir=cache_dir)
+
+        mock_encoder.encode.assert_called_once()
+        assert len(list(cache_dir.glob("*.f16.npy"))) == 2
+
+    def test_quantized_model_misses_cache(self, tmp_path, mock_encoder, mocker):
+        """Test that embeddings saved by the full-precision model aren't reused when quantized."""
+        mocker.patch("scripture_rag.vector_store.quantize_dynamic_int8")
+        cache_dir = tmp_path / "embeddings"
+        ScriptureVectorStore(persist_directory=tmp_path / "chroma").embed_documents(
+            ["a", "bb"], cache_dir=cache_dir
+        )
+
+        mock_encoder.encode.reset_mock()
+        quantized = ScriptureVectorStore(persist_directory=tmp_path / "chroma", quantize=True)
+        quantized.embed_documents(["a", "bb"], cache_dir=cache_dir)
+
+        mock_encoder.encode.assert_called_once()
+
+    def test_unreadable_cache_is_recomputed(self, store, mock_encoder, tmp_path):
+        """Test that a corrupt cache file is ignored and replaced."""
+        documents = ["a", "bb"]
+        cache_dir = tmp_path / "embeddings"
+        store.embed_documents(documents, cache_dir=cache_dir)
+        (cache_path,) = cache_dir.glob("*.f16.npy")
+        cache_path.write_bytes(b"not a numpy file")
+
+        mock_encoder.encode.reset_mock()
+        embeddings = store.embed_documents(documents, cache_dir=cache_dir)
+
+        mock_encoder.encode.assert_called_once()
+        assert embeddings.shape == (2, 4)
+        assert np.load(cache_path).dtype == np.float16
+
+
+class TestEmbedBatches:
+    """Tests for how document batches are scheduled."""
+
+    def test_look_ahead_encodes_next_batch(self, store, mock_encoder):
+        """Test that the next batch is encoded while the caller holds the current one."""
+        batches = store.iter_document_embeddings(["a", "bb", "ccc"], batch_size=1)
+
+        first = next(batches)
+
+        deadline = time.monotonic() + 5
+        while mock_encoder.encode.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert mock_encoder.encode.call_count == 2
+        assert first.shape == (1, 4)
+        assert [len(batch) for batch in batches] == [1, 1]
+
+    def test_look_ahead_keeps_document_order(self, store):
+        """Test that batches come back in document order."""
+        documents = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        batches = list(store.iter_document_embeddings(documents, batch_size=2))
+
+        np.testing.assert_allclose(np.concatenate(batches), _fake_encode(documents))
+
+    def test_large_corpus_uses_process_pool(self, store, mock_encoder, mocker):
+        """Test that a large CPU corpus is embedded across worker processes."""
+        mocker.patch.object(vector_store, "PARALLEL_EMBED_THRESHOLD", 3)
+        mocker.patch("scripture_rag.vector_store.os.cpu_count", return_value=6)
+        mock_pool = mocker.patch("scripture_rag.vector_store.ProcessPoolExecutor")
+        executor = mock_pool.return_value.__enter__.return_value
+        executor.map.side_effect = lambda fn, batches, sizes: map(_fake_encode, batches)
+
+        documents = ["a", "bb", "ccc", "dddd"]
+        batches = list(store.iter_document_embeddings(documents, batch_size=2))
+
+        mock_encoder.encode.assert_not_called()
+        assert mock_pool.call_args.kwargs["max_workers"] == 6 // vector_store.EMBED_WORKER_THREADS
+        assert mock_pool.call_args.kwargs["initargs"] == (EMBEDDING_MODEL_NAME, False)
+        assert executor.map.call_args.args[0] is vector_store._embed_in_worker
+        assert [len(batch) for batch in batches] == [2, 2]
+
+    def test_process_pool_size_is_capped(self, store, mocker):
+        """Test that a many-core machine doesn't load a model copy per pair of cores."""
+        mocker.patch.object(vector_store, "PARALLEL_EMBED_THRESHOLD", 3)
+        mocker.patch("scripture_rag.vector_store.os.cpu_count", return_value=64)
+        mock_pool = mocker.patch("scripture_rag.vector_store.ProcessPoolExecutor")
+        executor = mock_pool.return_value.__enter__.return_value
+        executor.map.side_effect = lambda fn, batches, sizes: map(_fake_encode, batches)
+
+        list(store.iter_document_embeddings(["a", "bb", "ccc", "dddd"], batch_size=2))
+
+        assert mock_pool.call_args.kwargs["max_workers"] == vector_store.MAX_EMBED_WORKERS
+
+    def test_small_corpus_skips_process_pool(self, store, mocker):
+        """Test that corpora under the threshold are embedded in this process."""
+        mocker.patch("scripture_rag.vector_store.os.cpu_count", return_value=8)
+        mock_pool = mocker.patch("scripture_rag.vector_store.ProcessPoolExecutor")
+
+        list(store.iter_document_embeddings(["a", "bb"], batch_size=1))
+
+        mock_pool.assert_not_called()
+
+    def test_worker_loads_private_model(self, mock_encoder, mocker):
+        """Test that a worker process loads its own model and embeds with it."""
+        mock_threads = mocker.patch("scripture_rag.vector_store.torch.set_num_threads")
+        mock_quantize = mocker.patch("scripture_rag.vector_store.quantize_dynamic_int8")
+        mocker.patch.object(vector_store, "_worker_model", None)
+
+        vector_store._init_embed_worker(EMBEDDING_MODEL_NAME, True)
+        embeddings = vector_store._embed_in_worker(["a", "bb"], 16)
+
+        mock_threads.assert_called_once_with(vector_store.EMBED_WORKER_THREADS)
+        mock_quantize.assert_called_once_with(mock_encoder)
+        assert embeddings.shape == (2, 4)
+
+
+class TestQueryEmbeddingCache:
+    """Tests for reusing query embeddings."""
+
+    def test_repeated_query_is_embedded_once(self, store, mock_encoder):
+        """Test that a query's embedding is reused from memory."""
+        first = store.embed_queries(["faith", "hope"])
+        second = store.embed_queries(["hope", "faith"])
+
+        mock_encoder.encode.assert_called_once()
+        np.testing.assert_array_equal(second, first[::-1])
+
+    def test_only_new_queries_are_embedded(self, store, mock_encoder):
+        """Test that a batch with some known queries only encodes the new ones."""
+        store.embed_queries(["faith"])
+        mock_encoder.encode.reset_mock()
+
+        store.embed_queries(["faith", "charity"])
+
+        assert mock_encoder.encode.call_args.args[0] == ["charity"]
+
+    def test_saved_query_embeddings_survive_restart(self, tmp_path, mock_encoder):
+        """Test that a new store reuses query embeddings saved in SQLite by an earlier one."""
+        persist_directory = tmp_path / "chroma"
+        first = ScriptureVectorStore(persist_directory=persist_directory).embed_queries(["faith"])
+        assert (persist_directory / vector_store.QUERY_EMBEDDING_DB).exists()
+
+        mock_encoder.encode.reset_mock()
+        second = ScriptureVectorStore(persist_directory=persist_directory).embed_queries(["faith"])
+
+        mock_encoder.encode.assert_not_called()
+        np.testing.assert_allclose(second, first)
+
+    def test_saved_query_embeddings_keyed_by_quantization(self, tmp_path, mock_encoder, mocker):
+        """Test that the quantized model doesn't reuse full-precision query embeddings."""
+        mocker.patch("scripture_rag.vector_store.quantize_dynamic_int8")
+        persist_directory = tmp_path / "chroma"
+        ScriptureVectorStore(persist_directory=persist_directory).embed_queries(["faith"])
+
+        mock_encoder.encode.reset_mock()
+        quantized = ScriptureVectorStore(persist_directory=persist_directory, quantize=True)
+        quantized.embed_queries(["faith"])
+
+        mock_encoder.encode.assert_called_once()
+
+
+class TestFilterCounts:
+    """Tests for the remembered filter counts."""
+
+    def test_sees_verses_added_by_another_store(self, tmp_path, mock_encoder, sample_chunks):
+        """Test that a store that saw an empty index finds verses another store added later."""
+        reader = ScriptureVectorStore(persist_directory=tmp_path / "chroma")
+        assert reader.query("hope", where={"book": "Ruth"})["documents"] == []
+        assert reader.query("hope")["documents"] == []
+
+        writer = ScriptureVectorStore(persist_directory=tmp_path / "chroma")
+        writer.add_chunks(sample_chunks[:1])
+
+        filtered = reader.query("hope", where={"book": "Ruth"})
+        unfiltered = reader.query("hope")
+
+        assert [m["reference"] for m in filtered["metadatas"]] == ["Ruth 1:1"]
+        assert unfiltered["documents"] == [sample_chunks[0].text]
+
+    def test_counts_reused_while_collection_unchanged(self, store, sample_chunks, mocker):
+        """Test that a filter is only counted once while the collection keeps its size."""
+        store.add_chunks(sample_chunks)
+        count = mocker.spy(store, "count")
+
+        store.query("hope", where={"book": "Ruth"})
+        store.query("faith", where={"book": "Ruth"})
+
+        assert [call.args for call in count.call_args_list].count(({"book": "Ruth"},)) == 1
+
+    def test_filter_subsets_expire(self, store, sample_chunks, mocker):
+        """Test that a loaded filter subset is reloaded once its TTL has passed."""
+        mock_monotonic = mocker.patch("scripture_rag.cache.time.monotonic", return_value=100.0)
+        store.add_chunks(sample_chunks)
+        store.query("hope", where={"book": "Ruth"})
+        subset = store._filter_subset({"book": "Ruth"})
+
+        mock_monotonic.return_value = 100.0 + vector_store.FILTER_SUBSET_TTL - 1
+        assert store._filter_subset({"book": "Ruth"}) is subset
+
+        mock_monotonic.return_value = 100.0 + vector_store.FILTER_SUBSET_TTL + 1
+        assert store._filter_subset({"book": "Ruth"}) is not subset
+
+
+@pytest.fixture
+def faiss_store(tmp_path, mock_encoder):
+    """A FAISS vector store whose encoder spreads texts far apart."""
+    pytest.importorskip("faiss")
+    mock_encoder.get_sentence_embedding_dimension.return_value = 8
+    mock_encoder.encode.side_effect = _random_encode
+    return FaissScriptureVectorStore(persist_directory=tmp_path / "faiss")
+
+
+class TestFaissScriptureVectorStore:
+    """Tests for FaissScriptureVectorStore class."""
+
+    def test_shares_base_store_state(self, faiss_store, tmp_path):
+        """Test that the FAISS store sets up the same caches as the Chroma store."""
+        assert faiss_store.persist_directory == tmp_path / "faiss"
+        assert faiss_store.collection_name == "scriptures"
+        assert faiss_store.brute_force_limit == 0
+        assert faiss_store.query_cache.threshold == 1.0
+        assert (tmp_path / "faiss" / vector_store.QUERY_EMBEDDING_DB).exists()
+        assert not hasattr(faiss_store, "client")
+
+    def test_unknown_precision(self, tmp_path, mock_encoder):
+        """Test that an unknown precision is rejected."""
+        with pytest.raises(ValueError, match="Unknown embedding precision"):
+            FaissScriptureVectorStore(persist_directory=tmp_path, precision="int4")
+
+    def test_add_and_query(self, faiss_store, sample_chunks):
+        """Test that added verses are found by their own text."""
+        faiss_store.add_chunks(sample_chunks)
+
+        results = faiss_store.query(sample_chunks[1].text, n_results=2)
+
+        assert faiss_store.count() == 3
+        assert len(results["documents"]) == 2
+        assert results["documents"][0] == sample_chunks[1].text
+        assert results["metadatas"][0]["reference"] == "Ruth 1:2"
+        assert results["distances"][0] == pytest.approx(0.0, abs=1e-5)
+
+    def test_filtered_query(self, faiss_store, sample_chunks):
+        """Test that a metadata filter restricts the results."""
+        faiss_store.add_chunks(sample_chunks)
+
+        results = faiss_store.query(sample_chunks[0].text, n_results=3, where={"book": "Jonah"})
+
+        assert faiss_store.count({"book": "Jonah"}) == 1
+        assert [m["reference"] for m in results["metadatas"]] == ["Jonah 1:1"]
+
+    def test_reopen_from_disk(self, faiss_store, sample_chunks, tmp_path):
+        """Test that a new store on the same directory loads the saved index."""
+        faiss_store.add_chunks(sample_chunks)
+
+        reopened = FaissScriptureVectorStore(persist_directory=tmp_path / "faiss")
+        results = reopened.query(sample_chunks[2].text, n_results=1)
+
+        assert reopened.count() == 3
+        assert results["metadatas"][0]["reference"] == "Jonah 1:1"
+
+    def test_clear_collection(self, faiss_store, sample_chunks):
+        """Test that clearing the index removes every verse."""
+        faiss_store.add_chunks(sample_chunks)
+
+        faiss_store.clear_collection()
+
+        assert faiss_store.count() == 0
+        assert faiss_store.query(sample_chunks[0].text)["documents"] == []
+
+
+@pytest.fixture(params=["int8", "binary"])
+def quantized_faiss_store(request, faiss_store, tmp_path):
+    """A FAISS vector store keeping its index at reduced precision."""
+    return FaissScriptureVectorStore(persist_directory=tmp_path / "faiss", precision=request.param)
+
+
+class TestQuantizedFaissScriptureVectorStore:
+    """Tests for FaissScriptureVectorStore with int8 and binary indexes."""
+
+    def test_add_and_query(self, quantized_faiss_store, sample_chunks):
+        """Test that added verses are still ranked first for their own text."""
+        quantized_faiss_store.add_chunks(sample_chunks)
+
+        for chunk in sample_chunks:
+            results = quantized_faiss_store.query(chunk.text, n_results=3)
+            assert results["documents"][0] == chunk.text
+            assert results["distances"] == sorted(results["distances"])
+
+        assert quantized_faiss_store.count() == 3
+
+    def test_filtered_query_with_embeddings(self, quantized_faiss_store, sample_chunks):
+        """Test that a filtered query returns the stored, dequantized embeddings."""
+        quantized_faiss_store.add_chunks(sample_chunks)
+
+        results = quantized_faiss_store.query(
+            sample_chunks[0].text, n_results=3, where={"book": "Ruth"}, include_embeddings=True
+        )
+
+        assert [m["reference"] for m in results["metadatas"]] == ["Ruth 1:1", "Ruth 1:2"]
+        assert results["embeddings"].shape == (2, 8)
+        expected = _random_encode([chunk.text for chunk in sample_chunks[:2]])
+        if quantized_faiss_store.precision == "binary":
+            expected = np.where(expected > 0, 1.0, -1.0) / np.sqrt(8)
+            np.testing.assert_allclose(results["embeddings"], expected, rtol=1e-6)
+        else:
+            np.testing.assert_allclose(results["embeddings"], expected, atol=0.02)
+
+    def test_reopen_from_disk(self, quantized_faiss_store, sample_chunks, tmp_path):
+        """Test that a new store with the same precision loads the saved index."""
+        quantized_faiss_store.add_chunks(sample_chunks)
+        precision = quantized_faiss_store.precision
+
+        reopened = FaissScriptureVectorStore(
+            persist_directory=tmp_path / "faiss", precision=precision
+        )
+        results = reopened.query(sample_chunks[2].text, n_results=1)
+
+        assert (tmp_path / "faiss" / f"scriptures-{precision}.faiss").exists()
+        assert reopened.count() == 3
+        assert reopened.get_or_create_collection().index.is_trained
+        assert results["metadatas"][0]["reference"] == "Jonah 1:1"
+
+    def test_kept_apart_from_float32_index(self, quantized_faiss_store, faiss_store, sample_chunks):
+        """Test that each precision has its own index files."""
+        quantized_faiss_store.add_chunks(sample_chunks)
+
+        assert faiss_store.count() == 0